@@ -0,0 +1,266 @@
+"""
+Benchmarks de las rutas críticas del Timbiriche sobre el motor sin interfaz.
+
+Para cada tamaño de tablero mide la latencia por llamada (percentiles 50, 90 y
+99 en microsegundos) de get_available_lines, possible_squares, check_square,
+add_line (que lleva el puntaje) y la jugada de la computadora, la memoria
+asignada por llamada con tracemalloc y el tiempo de una partida completa.
+
+Como muchas de estas llamadas duran menos de un microsegundo, cada muestra es
+un lote de llamadas (al estilo de timeit) que dura al menos LOTE_MINIMO_NS, y
+se reporta el tiempo por llamada de cada lote; la partida completa se repite y
+se toma la mediana. Al comparar se omiten las métricas por debajo de la
+resolución del reloj.
+
+Ejemplos:
+    python benchmark_timbiriche.py --sizes 5 10 20 50 100 --guardar baseline.json
+    python benchmark_timbiriche.py --comparar baseline.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from motor_timbiriche import TableroTimbiriche
+
+SIZES = (5, 10, 20, 50, 100)
+MUESTRAS = 30              # Lotes (o partidas) medidos por función y tamaño
+LOTE_MINIMO_NS = 200_000   # Duración mínima de un lote, muy por encima del costo del reloj
+
+
+def _percentiles(muestras):
+    """Percentiles 50, 90 y 99 en microsegundos de una lista de tiempos en nanosegundos"""
+    muestras = sorted(muestras)
+    ultimo = len(muestras) - 1
+    return {f"p{p}": round(muestras[ultimo * p // 100] / 1000, 3) for p in (50, 90, 99)}
+
+
+def _tablero_a_medias(motor, size, semilla):
+    """Tablero con la mitad de las líneas trazadas al azar"""
+    rng = random.Random(semilla)
+    board = motor(size)
+    lines = board.get_available_lines()
+    rng.shuffle(lines)
+    for edge in lines[:len(lines) // 2]:
+        board.add_line(edge)
+    return board, rng
+
+
+def resolucion_reloj_ns():
+    """
+    Menor intervalo que distingue el reloj: el mayor entre la resolución que
+    declara y el menor salto observado entre dos lecturas seguidas (su costo).
+    """
+    reloj = time.perf_counter_ns
+    salto = min((b - a for a, b in ((reloj(), reloj()) for _ in range(1000)) if b > a), default=0)
+    return max(salto, time.get_clock_info("perf_counter").resolution * 1e9)
+
+
+def _lote(funcion, argumentos):
+    """
+    Llamadas por lote para que un lote dure al menos LOTE_MINIMO_NS, duplicando
+    el tamaño como timeit.Timer.autorange; de paso sirve de calentamiento.
+    """
+    reloj = time.perf_counter_ns
+    lote = 1
+    while True:
+        llamadas = list(itertools.islice(itertools.cycle(argumentos), lote))
+        t = reloj()
+        for args in llamadas:
+            funcion(*args)
+        if reloj() - t >= LOTE_MINIMO_NS:
+            return lote
+        lote *= 2
+
+
+def _medir_llamadas(funcion, argumentos, muestras=MUESTRAS):
+    """
+    Tiempo por llamada en nanosegundos de cada lote de llamadas funcion(*args),
+    recorriendo en ciclo la lista de argumentos. Retorna una muestra por lote.
+    """
+    reloj = time.perf_counter_ns
+    lote = _lote(funcion, argumentos)
+    ciclo = itertools.cycle(argumentos)
+    tiempos = []
+    for _ in range(muestras):
+        llamadas = list(itertools.islice(ciclo, lote))
+        t = reloj()
+        for args in llamadas:
+            funcion(*args)
+        tiempos.append((reloj() - t) / lote)
+    return tiempos
+
+
+def _medir_add_line(motor, size, orden, muestras=MUESTRAS):
+    """
+    Tiempo por llamada de add_line: cada muestra traza todas las líneas en el
+    orden dado sobre un tablero nuevo (creado fuera de la medición).
+    """
+    reloj = time.perf_counter_ns
+    tiempos = []
+    for _ in range(muestras + 1):  # La primera es de calentamiento
+        add_line = motor(size).add_line
+        t = reloj()
+        for edge in orden:
+            add_line(edge)
+        tiempos.append((reloj() - t) / len(orden))
+    return tiempos[1:]
+
+
+def _memoria_por_llamada(funcion, argumentos):
+    """Bytes asignados en promedio por llamada, según tracemalloc"""
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.take_snapshot()
+        resultados = [funcion(*args) for args in argumentos]  # Se conservan para contar lo que retornan
+        despues = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    asignado = sum(stat.size_diff for stat in despues.compare_to(antes, "filename") if stat.size_diff > 0)
+    del resultados
+    return round(asignado / max(1, len(argumentos)), 1)
+
+
+def _partida(motor, size, semilla):
+    """
+    Juega una partida voraz completa sobre un tablero nuevo.
+
+    Retorna (nanosegundos, jugadas); la creación del tablero no se mide.
+    """
+    rng = random.Random(semilla)
+    board = motor(size)
+    reloj = time.perf_counter_ns
+    jugadas = 0
+    t = reloj()
+    while not board.is_over():
+        board.add_line(board.choose_line(rng))
+        jugadas += 1
+    return reloj() - t, jugadas
+
+
+def medir_tamano(size, repeticiones, semilla=0, motor=TableroTimbiriche, muestras=MUESTRAS):
+    """
+    Mide todas las rutas críticas para un tamaño de tablero con la clase de
+    motor dada; repeticiones es el número de argumentos distintos por función.
+    """
+    board, rng = _tablero_a_medias(motor, size, semilla)
+    libres = board.get_available_lines()
+    trazadas = [edge for edge in range(board.num_lines) if board.is_drawn(edge)]
+    aleatorias = [(rng.choice(libres),) for _ in range(repeticiones)]
+    dibujadas = [(rng.choice(trazadas),) for _ in range(repeticiones)]
+
+    casos = {
+        "get_available_lines": (board.get_available_lines, [()] * max(1, repeticiones // 10)),
+        "possible_squares": (board.possible_squares, aleatorias),
+        "check_square": (board.check_square, dibujadas),
+        "classify_lines": (board.classify_lines, [()] * max(1, repeticiones // 10)),
+    }
+    resultado = {}
+    for nombre, (funcion, argumentos) in casos.items():
+        resultado[nombre] = _percentiles(_medir_llamadas(funcion, argumentos, muestras))
+        resultado[nombre]["bytes_por_llamada"] = _memoria_por_llamada(funcion, argumentos)
+
+    # Jugada de la computadora (con su add_line) y partida completa: varias partidas, tras una de calentamiento
+    _partida(motor, size, semilla)
+    partidas = [_partida(motor, size, semilla) for _ in range(muestras)]
+    resultado["computer_turn"] = _percentiles([ns / jugadas for ns, jugadas in partidas])
+    resultado["partida_completa_ms"] = round(statistics.median(ns for ns, _ in partidas) / 1e6, 3)
+
+    fresco = motor(size)
+    orden = fresco.get_available_lines()
+    rng.shuffle(orden)
+    resultado["add_line"] = _percentiles(_medir_add_line(motor, size, orden, muestras))
+    resultado["add_line"]["bytes_por_llamada"] = _memoria_por_llamada(fresco.add_line, [(edge,) for edge in orden])
+
+    tracemalloc.start()
+    _partida(motor, size, semilla)
+    resultado["partida_pico_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return resultado
+
+
+def comparar(actual, base, tolerancia):
+    """
+    Lista las métricas de latencia p50 y de partida completa que empeoraron más
+    de la tolerancia. Se omiten las latencias que en la base quedaron por debajo
+    de la resolución del reloj de cualquiera de las dos corridas.
+    """
+    resolucion_us = max(actual.get("resolucion_us", 0), base.get("resolucion_us", 0))
+    regresiones = []
+    for size, metricas in actual["resultados"].items():
+        previas = base["resultados"].get(size)
+        if previas is None:
+            continue
+        for nombre, valor in metricas.items():
+            antes = previas.get(nombre)
+            if isinstance(valor, dict):
+                valor, antes = valor.get("p50"), (antes or {}).get("p50")
+            if not isinstance(valor, (int, float)) or not antes:
+                continue
+            if isinstance(previas.get(nombre), dict) and antes < resolucion_us:
+                continue  # Por debajo de lo que distingue el reloj
+            razon = valor / antes
+            if razon > 1 + tolerancia:
+                regresiones.append(f"size={size} {nombre}: {antes} -> {valor} ({razon:.2f}x)")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de las rutas críticas del Timbiriche")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Tamaños de tablero a medir")
+    parser.add_argument("--repeticiones", type=int, default=2000, help="Argumentos distintos por función y tamaño")
+    parser.add_argument("--muestras", type=int, default=MUESTRAS,
+                        help="Lotes de llamadas (y partidas completas) medidos por función y tamaño")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--guardar", help="Guarda los resultados en este archivo JSON")
+    parser.add_argument("--comparar", help="Compara contra un archivo JSON guardado previamente")
+    parser.add_argument("--numpy", action="store_true", help="Mide el motor vectorizado (requiere NumPy)")
+    parser.add_argument("--tolerancia", type=float, default=0.5, help="Empeoramiento relativo permitido (0.5 = 50%%)")
+    args = parser.parse_args(argv)
+    if args.repeticiones <= 0 or args.muestras <= 0:
+        parser.error("Las repeticiones y las muestras deben ser mayores que cero.")
+
+    motor = TableroTimbiriche
+    if args.numpy:
+        from motor_numpy import TableroNumpy
+        motor = TableroNumpy
+
+    actual = {
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "motor": motor.__name__,
+        "resolucion_us": round(resolucion_reloj_ns() / 1000, 3),
+        "resultados": {},
+    }
+    for size in args.sizes:
+        actual["resultados"][str(size)] = medir_tamano(size, args.repeticiones, args.semilla, motor, args.muestras)
+        print(f"size={size}: {json.dumps(actual['resultados'][str(size)])}", file=sys.stderr)
+
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as f:
+            json.dump(actual, f, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        # Las bases anteriores al campo "motor" se midieron con el motor incremental
+        motor_base = base.get("motor", TableroTimbiriche.__name__)
+        if motor_base != actual["motor"]:
+            print(f"La base se midió con {motor_base} y esta corrida con {actual['motor']}; "
+                  "no se pueden comparar.", file=sys.stderr)
+            sys.exit(2)
+        regresiones = comparar(actual, base, args.tolerancia)
+        for linea in regresiones:
+            print(f"REGRESIÓN {linea}")
+        if regresiones:
+            sys.exit(1)
+        print("Sin regresiones respecto a la base.")
+
+
+if __name__ == "__main__":
+    main()
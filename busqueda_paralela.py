@@ -0,0 +1,160 @@
+"""
+Búsqueda del Timbiriche con las jugadas de la raíz repartidas entre procesos.
+
+Un ProcessPoolExecutor persistente atiende todas las jugadas de una partida. A
+cada proceso sólo se le envía la posición codificada de forma compacta (tamaño
+del tablero, máscara de líneas trazadas y lados trazados de cada cuadro como
+bytes) y un grupo de jugadas de la raíz; cada proceso conserva su propio
+BuscadorTimbiriche, con su tabla de transposición, entre jugadas.
+
+Los procesos comparten la mejor cota alfa de la iteración en un
+multiprocessing.Value, entregado por el inicializador del grupo: antes de
+buscar cada jugada de la raíz se toma la cota más alta encontrada por
+cualquiera, así que las jugadas peores se descartan igual que en la búsqueda
+secuencial. Si se acaba el tiempo, cada proceso retorna lo que alcanzó a
+evaluar y se usa la mejor jugada conocida.
+
+Al crear el grupo se arrancan todos los procesos y cada uno crea su buscador en
+el inicializador; el constructor espera a que terminen, así que la primera
+jugada ya no paga el arranque.
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ia_timbiriche import INFINITO, BuscadorTimbiriche, _TiempoAgotado
+from tabla_finales import cargar_tabla
+
+_alfa = None         # Cota compartida de la iteración (en cada proceso del grupo)
+_barrera = None      # Sincroniza el calentamiento: una tarea por proceso
+_buscadores = {}     # Buscador de cada proceso por (tamaño, usa tabla de finales)
+ESPERA_CALENTAMIENTO = 60  # Segundos máximos para arrancar los procesos
+
+
+def _inicializar(alfa, barrera, size, usar_tabla):
+    """Al arrancar cada proceso: guarda los objetos compartidos y crea su buscador"""
+    global _alfa, _barrera
+    _alfa, _barrera = alfa, barrera
+    _buscador(size, usar_tabla)
+
+
+def _buscador(size, usar_tabla):
+    clave = (size, usar_tabla)
+    if clave not in _buscadores:
+        _buscadores[clave] = BuscadorTimbiriche(size, endgame_table=cargar_tabla(size) if usar_tabla else None)
+    return _buscadores[clave]
+
+
+def _calentar():
+    """
+    Tarea de calentamiento: espera a que todos los procesos tengan la suya, así
+    que cada proceso del grupo arranca (y se inicializa) exactamente una vez
+    antes de la primera jugada.
+    """
+    _barrera.wait(ESPERA_CALENTAMIENTO)
+
+
+def _evaluar(size, usar_tabla, lines, sides, moves, depth, deadline):
+    """
+    Evalúa a la profundidad dada un grupo de jugadas de la raíz.
+
+    Retorna (resultados, nodos, completo): resultados es una lista de
+    (jugada, valor, exacto), donde exacto es False si el valor sólo es una cota
+    superior (la jugada no supera la cota alfa con que se buscó); completo es
+    False si se acabó el tiempo antes de evaluar todas las jugadas.
+    """
+    ai = _buscador(size, usar_tabla)
+    ai.load_position(lines, sides, deadline)
+    resultados = []
+    completo = True
+    alpha = -INFINITO
+    try:
+        for edge in moves:
+            alpha = max(alpha, _alfa.value)
+            value = ai._child_value(edge, depth, alpha, INFINITO)
+            resultados.append((edge, value, value > alpha))
+            if value > alpha:
+                alpha = value
+                with _alfa.get_lock():
+                    if value > _alfa.value:
+                        _alfa.value = value
+    except _TiempoAgotado:
+        completo = False
+    return resultados, ai.nodes, completo
+
+
+class BusquedaParalela:
+    """Grupo de procesos que busca en paralelo las jugadas de la raíz"""
+
+    def __init__(self, processes, size, use_table=False):
+        """
+        Arranca los procesos y espera a que todos estén listos, para que la
+        primera jugada no gaste su tiempo en iniciarlos.
+
+        Parámetros:
+        - processes: número de procesos del grupo.
+        - size: tamaño del tablero, para crear de antemano el buscador de cada proceso.
+        - use_table: si los buscadores usan la tabla de finales del tamaño dado.
+        """
+        self.processes = processes
+        # "spawn" evita copiar en los procesos el estado de tkinter de la ventana
+        contexto = multiprocessing.get_context("spawn")
+        self.alfa = contexto.Value("i", -INFINITO)
+        barrera = contexto.Barrier(processes)
+        self.executor = ProcessPoolExecutor(processes, mp_context=contexto, initializer=_inicializar,
+                                            initargs=(self.alfa, barrera, size, use_table))
+        for future in [self.executor.submit(_calentar) for _ in range(processes)]:
+            future.result()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def search(self, ai, lines, sides, max_depth, budget):
+        """
+        Profundización iterativa con la raíz repartida entre los procesos.
+
+        ai es el BuscadorTimbiriche que pidió la búsqueda: se usa para ordenar
+        las jugadas y en él se dejan los nodos y la profundidad alcanzada.
+        Retorna la mejor jugada encontrada antes del límite de tiempo.
+        """
+        start = time.perf_counter()
+        deadline = start + budget
+        usar_tabla = ai.endgame_table is not None
+        ai.load_position(lines, sides, deadline)
+        completing, safe, dangerous = ai._classify()
+        moves = completing + safe + dangerous
+        if not moves:
+            return None
+        sides = bytes(sides)
+        best = moves[0]
+        nodes = 0
+        for depth in range(1, min(max_depth, len(moves)) + 1):
+            ordered = [best] + [m for m in moves if m != best]
+            # Grupos intercalados: la mejor jugada anterior abre el primero y fija pronto la cota
+            groups = [ordered[i::self.processes] for i in range(min(self.processes, len(ordered)))]
+            self.alfa.value = -INFINITO
+            futures = [self.executor.submit(_evaluar, ai.size, usar_tabla, lines, sides, group, depth, deadline)
+                       for group in groups]
+
+            values, exact, complete = {}, {}, True
+            for future in futures:
+                results, group_nodes, group_complete = future.result()
+                nodes += group_nodes
+                complete &= group_complete
+                for edge, value, is_exact in results:
+                    values[edge] = value
+                    if is_exact:
+                        exact[edge] = value
+            if exact:
+                candidate = max(exact, key=exact.get)
+                # Con la iteración incompleta sólo se cambia de jugada si la anterior ya se
+                # evaluó y resultó peor (o quedó por debajo de la cota de otra jugada)
+                if complete or (best in values and (best not in exact or exact[candidate] > values[best])):
+                    best = candidate
+            if not complete:
+                break
+            ai.depth_reached = depth
+            if time.perf_counter() - start > budget / 2:
+                break  # La siguiente iteración difícilmente terminaría a tiempo
+        ai.nodes = nodes
+        return best
@@ -0,0 +1,161 @@
+"""
+Generador de carga para servidor.py.
+
+Abre varias conexiones y mantiene en cada una varias sesiones abiertas a la
+vez, jugando al azar contra la computadora hasta completar las partidas
+pedidas. Al terminar reporta la latencia de los comandos vista por los
+clientes, las partidas por segundo y las métricas del servidor (incluidas las
+sesiones por núcleo).
+
+Ejemplo (con el servidor ya corriendo):
+    python carga_servidor.py --conexiones 50 --sesiones 2000 --partidas 10000 --juego mixto
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from motor_timbiriche import crear_tablero
+from servidor import PUERTO
+
+
+class Cliente:
+    """Una conexión al servidor con sus sesiones abiertas"""
+
+    def __init__(self, reader, writer, latencias):
+        self.reader = reader
+        self.writer = writer
+        self.latencias = latencias
+
+    async def enviar(self, comando):
+        """Envía un comando y espera su respuesta, midiendo la latencia"""
+        t = time.perf_counter()
+        self.writer.write(comando.encode() + b"\n")
+        respuesta = json.loads(await self.reader.readline())
+        self.latencias.append(time.perf_counter() - t)
+        if not respuesta["ok"]:
+            raise RuntimeError(f"{comando!r}: {respuesta['error']}")
+        return respuesta
+
+
+class Partida:
+    """Partida del lado del cliente; en Timbiriche replica el tablero para elegir líneas libres"""
+
+    def __init__(self, juego, rng, args):
+        self.juego = juego
+        self.rng = rng
+        self.numero = None
+        if juego == "palillos":
+            self.palillos, self.maximo = args.palillos, args.maximo
+            self.comando = f"NUEVO palillos {args.palillos} {args.maximo}"
+        else:
+            self.board = crear_tablero(args.size)
+            self.comando = f"NUEVO timbiriche {args.size} {args.nivel} {rng.choice((1, 2))}"
+
+    def aplicar(self, respuesta):
+        """Actualiza la copia local con la respuesta; retorna True si la partida terminó"""
+        self.numero = respuesta["sesion"]
+        estado = respuesta["estado"]
+        if self.juego == "palillos":
+            self.palillos = estado["palillos"]
+        else:
+            for edge in respuesta["computadora"]:
+                self.board.add_line(edge)
+        return estado["ganador"] is not None
+
+    def jugada(self):
+        """Comando JUGAR con una jugada al azar"""
+        if self.juego == "palillos":
+            valor = self.rng.randint(1, min(self.maximo, self.palillos))
+        else:
+            valor = self.board.choose_line(self.rng) if self.rng.random() < 0.5 else \
+                self.rng.choice(self.board.get_available_lines())
+            self.board.add_line(valor)
+        return f"JUGAR {self.numero} {valor}"
+
+
+async def conexion(host, puerto, sesiones, pendientes, args, rng, latencias, terminadas):
+    """Juega partidas en una conexión, con hasta sesiones partidas abiertas a la vez"""
+    reader, writer = await asyncio.open_connection(host, puerto, limit=1 << 16)
+    cliente = Cliente(reader, writer, latencias)
+    abiertas = []
+    try:
+        while abiertas or pendientes[0] > 0:
+            # Abre sesiones hasta llenar el cupo de la conexión
+            while len(abiertas) < sesiones and pendientes[0] > 0:
+                pendientes[0] -= 1
+                juego = args.juego if args.juego != "mixto" else rng.choice(("palillos", "timbiriche"))
+                partida = Partida(juego, rng, args)
+                if partida.aplicar(await cliente.enviar(partida.comando)):
+                    await cliente.enviar(f"CERRAR {partida.numero}")
+                    terminadas.append(juego)
+                else:
+                    abiertas.append(partida)
+            # Una jugada en cada sesión abierta
+            siguen = []
+            for partida in abiertas:
+                if partida.aplicar(await cliente.enviar(partida.jugada())):
+                    await cliente.enviar(f"CERRAR {partida.numero}")
+                    terminadas.append(partida.juego)
+                else:
+                    siguen.append(partida)
+            abiertas = siguen
+    finally:
+        writer.close()
+
+
+async def cargar(args):
+    """Ejecuta la carga completa y retorna el reporte"""
+    rng = random.Random(args.semilla)
+    latencias, terminadas = [], []
+    pendientes = [args.partidas]  # Compartido entre las conexiones
+    por_conexion = max(1, args.sesiones // args.conexiones)
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        conexion(args.host, args.puerto, por_conexion, pendientes, args, random.Random(rng.random()),
+                 latencias, terminadas)
+        for _ in range(args.conexiones)
+    ))
+    segundos = time.perf_counter() - inicio
+
+    reader, writer = await asyncio.open_connection(args.host, args.puerto, limit=1 << 16)
+    writer.write(b"METRICAS\n")
+    metricas = json.loads(await reader.readline())["metricas"]
+    writer.close()
+
+    latencias.sort()
+    ultimo = len(latencias) - 1
+    return {
+        "conexiones": args.conexiones,
+        "sesiones_simultaneas": por_conexion * args.conexiones,
+        "partidas": len(terminadas),
+        "comandos": len(latencias),
+        "segundos": round(segundos, 3),
+        "partidas_por_segundo": round(len(terminadas) / segundos, 2),
+        "comandos_por_segundo": round(len(latencias) / segundos, 2),
+        "latencia_cliente_ms": {f"p{p}": round(latencias[ultimo * p // 100] * 1000, 3) for p in (50, 90, 99)},
+        "servidor": metricas,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generador de carga para el servidor de partidas")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--conexiones", type=int, default=20, help="Conexiones TCP simultáneas")
+    parser.add_argument("--sesiones", type=int, default=1000, help="Sesiones abiertas a la vez, repartidas entre las conexiones")
+    parser.add_argument("--partidas", type=int, default=2000, help="Partidas a jugar en total")
+    parser.add_argument("--juego", choices=("palillos", "timbiriche", "mixto"), default="mixto")
+    parser.add_argument("--palillos", type=int, default=21)
+    parser.add_argument("--maximo", type=int, default=3)
+    parser.add_argument("--size", type=int, default=5)
+    parser.add_argument("--nivel", type=int, default=0)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(cargar(args)), indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
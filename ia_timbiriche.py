@@ -0,0 +1,351 @@
+import random
+import time
+from functools import lru_cache
+
+from motor_timbiriche import _tablas
+
+# Niveles de dificultad: (profundidad máxima, segundos por jugada, máximo de
+# líneas seguras para buscar en lugar de jugar de forma voraz).
+# El nivel 0 es la estrategia voraz original.
+NIVELES = {
+    0: None,
+    1: (2, 0.1, 4),
+    2: (6, 0.4, 8),
+    3: (64, 0.9, 12),
+}
+
+# Tipos de entrada en la tabla de transposición
+EXACTO, COTA_INFERIOR, COTA_SUPERIOR = 0, 1, 2
+
+INFINITO = 1 << 20
+
+
+class _TiempoAgotado(Exception):
+    """Se lanza dentro de la búsqueda cuando se acaba el tiempo de la jugada"""
+
+
+@lru_cache(maxsize=None)
+def _zobrist(size):
+    """Números aleatorios de 64 bits por línea para el hash de Zobrist (fijos por tamaño)"""
+    rng = random.Random(size)
+    num_lines = 2 * size * (size - 1)
+    return tuple(rng.getrandbits(64) for _ in range(num_lines))
+
+
+@lru_cache(maxsize=1 << 16)
+def valor_cadenas(componentes):
+    """
+    Valor exacto de un final "simple" de Timbiriche para el jugador que debe abrir
+    una cadena o un ciclo (todas las líneas libres regalan cuadros).
+
+    Parámetros:
+    - componentes: tupla ordenada de pares (es_ciclo, longitud).
+
+    Al abrir una cadena de longitud L el rival puede llevarse todo y abrir la
+    siguiente, o llevarse L - 2 y regalar los 2 últimos cuadros para conservar el
+    control (en un ciclo regala 4). Las cadenas de 1 y 2 cuadros no permiten
+    regalar. Retorna la diferencia de cuadros (propios - rival) desde aquí.
+    """
+    if not componentes:
+        return 0
+    mejor = -INFINITO
+    for i, (es_ciclo, longitud) in enumerate(componentes):
+        if i and componentes[i - 1] == componentes[i]:
+            continue  # Abrir componentes iguales da el mismo resultado
+        resto = valor_cadenas(componentes[:i] + componentes[i + 1:])
+        tomar_todo = -(longitud + resto)
+        if es_ciclo:
+            valor = min(tomar_todo, 8 - longitud + resto)
+        elif longitud <= 2:
+            valor = tomar_todo
+        else:
+            valor = min(tomar_todo, 4 - longitud + resto)
+        mejor = max(mejor, valor)
+    return mejor
+
+
+class BuscadorTimbiriche:
+    """
+    Jugador por búsqueda para el Timbiriche.
+
+    Usa alfa-beta (negamax) con profundización iterativa sobre la máscara de bits
+    de líneas, una tabla de transposición de tamaño fijo indexada por hash de
+    Zobrist, ordenamiento de jugadas (completar, seguras, peligrosas) y, en los
+    finales, la descomposición del tablero en cadenas y ciclos.
+    """
+
+    def __init__(self, size, level=2, table_bits=16, rng=random, endgame_table=None, processes=1):
+        """
+        Parámetros:
+        - size: número de puntos por lado del tablero.
+        - level: nivel de dificultad (ver NIVELES).
+        - table_bits: la tabla de transposición tiene 2**table_bits entradas.
+        - rng: generador aleatorio para la estrategia voraz.
+        - endgame_table: tabla de finales (tabla_finales.TablaFinales) opcional
+          para jugar de forma perfecta cuando quedan pocas líneas.
+        - processes: si es mayor que 1, las jugadas de la raíz se reparten entre
+          ese número de procesos (ver busqueda_paralela).
+        """
+        self.size = size
+        self.level = level
+        self.rng = rng
+        self.num_lines = 2 * size * (size - 1)
+        self.num_boxes = (size - 1) ** 2
+        # El nivel voraz sólo consulta el tablero: las tablas de la búsqueda, que en
+        # tableros grandes tardan más en crearse que el propio tablero, son para los demás
+        busca = NIVELES[level] is not None
+        self.box_edges, self.edge_boxes = _tablas(size) if busca else (None, None)
+        self.zobrist = _zobrist(size) if busca else None
+        self.table_mask = (1 << table_bits) - 1
+        # Entradas (líneas, profundidad, valor, tipo, jugada, edad)
+        self.table = [None] * (1 << table_bits) if busca else None
+        self.age = 0
+        self.nodes = 0          # Nodos visitados en la última búsqueda
+        self.depth_reached = 0  # Profundidad completada en la última búsqueda
+        if endgame_table is not None and endgame_table.size != size:
+            endgame_table = None  # La tabla es de otro tamaño de tablero
+        self.endgame_table = endgame_table
+        self.table_free = endgame_table.max_libres if endgame_table is not None else -1
+        self.parallel = None
+        if processes > 1 and NIVELES[level] is not None:
+            from busqueda_paralela import BusquedaParalela  # Importa este módulo
+            self.parallel = BusquedaParalela(processes, size, endgame_table is not None)
+
+    def close(self):
+        """Detiene los procesos de la búsqueda en paralelo, si los hay"""
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+
+    # Punto de entrada
+
+    def choose_line(self, board):
+        """Elige la línea a trazar para el jugador actual del tablero dado"""
+        config = NIVELES[self.level]
+        if config is None:
+            return board.choose_line(self.rng)
+        max_depth, budget, search_safe = config
+
+        if self.endgame_table is not None and self.endgame_table.covers(board.lines):
+            return self.endgame_table.best_line(board.lines)  # Final resuelto: una consulta por jugada
+
+        if board.safe_count() > search_safe:
+            # Aún hay muchas jugadas seguras: capturar y jugar seguro es suficiente
+            return board.choose_line(self.rng)
+        return self.search(board.lines, board.sides, max_depth, budget)
+
+    def search(self, lines, sides, max_depth, budget):
+        """
+        Búsqueda por profundización iterativa con límite de tiempo.
+
+        Retorna la mejor jugada de la última profundidad completada.
+        """
+        if self.parallel is not None:
+            return self.parallel.search(self, lines, sides, max_depth, budget)
+        self.load_position(lines, sides, time.perf_counter() + budget)
+
+        completing, safe, dangerous = self._classify()
+        moves = completing + safe + dangerous
+        if not moves:
+            return None
+        best = moves[0]
+        start = time.perf_counter()
+        for depth in range(1, min(max_depth, len(moves)) + 1):
+            try:
+                value, best = self._root(depth, moves, best)
+            except _TiempoAgotado:
+                break
+            self.depth_reached = depth
+            if time.perf_counter() - start > budget / 2:
+                break  # La siguiente iteración difícilmente terminaría a tiempo
+        return best
+
+    def load_position(self, lines, sides, deadline):
+        """
+        Prepara el estado de búsqueda a partir de la máscara de líneas trazadas y
+        los lados trazados de cada cuadro; la búsqueda se corta en deadline
+        (según time.perf_counter).
+        """
+        self.lines = lines
+        self.sides = bytearray(sides)
+        self.drawn = bytearray((lines >> edge) & 1 for edge in range(self.num_lines))
+        self.hash = 0
+        for edge in range(self.num_lines):
+            if self.drawn[edge]:
+                self.hash ^= self.zobrist[edge]
+        self.remaining = sum(1 for s in self.sides if s < 4)
+        self.free_lines = self.num_lines - sum(self.drawn)
+        self.deadline = deadline
+        self.nodes = 0
+        self.depth_reached = 0
+        self.age = (self.age + 1) & 0xFF
+
+    # Búsqueda
+
+    def _root(self, depth, moves, previous_best):
+        """Busca todas las jugadas de la raíz, empezando por la mejor de la iteración anterior"""
+        ordered = [previous_best] + [m for m in moves if m != previous_best]
+        alpha, beta = -INFINITO, INFINITO
+        best_move = ordered[0]
+        for edge in ordered:
+            value = self._child_value(edge, depth, alpha, beta)
+            if value > alpha:
+                alpha, best_move = value, edge
+        return alpha, best_move
+
+    def _child_value(self, edge, depth, alpha, beta):
+        """Valor de una jugada desde el punto de vista de quien la hace"""
+        captured = self._make(edge)
+        try:
+            if captured:
+                # Quien completa un cuadro vuelve a jugar: misma perspectiva
+                return captured + self._negamax(depth - 1, alpha - captured, beta - captured)
+            return -self._negamax(depth - 1, -beta, -alpha)
+        finally:
+            self._unmake(edge)
+
+    def _negamax(self, depth, alpha, beta):
+        """Diferencia de cuadros (propios - rival) que puede asegurar el jugador en turno"""
+        self.nodes += 1
+        if self.nodes & 31 == 0 and time.perf_counter() > self.deadline:
+            raise _TiempoAgotado
+        if self.remaining == 0:
+            return 0
+        if self.free_lines <= self.table_free:
+            return self.endgame_table.value(self.lines)  # Valor exacto de la tabla de finales
+
+        slot = self.hash & self.table_mask
+        entry = self.table[slot]
+        tt_move = None
+        if entry is not None and entry[0] == self.lines:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                value, kind = entry[2], entry[3]
+                if kind == EXACTO:
+                    return value
+                if kind == COTA_INFERIOR and value >= beta:
+                    return value
+                if kind == COTA_SUPERIOR and value <= alpha:
+                    return value
+
+        completing, safe, dangerous = self._classify()
+        if depth <= 0:
+            if not completing:
+                return self._evaluate(safe)
+            moves = completing  # Quiescencia: sólo se extienden las capturas
+        else:
+            moves = completing + safe + dangerous
+            if tt_move in moves:
+                moves.remove(tt_move)
+                moves.insert(0, tt_move)
+
+        original_alpha = alpha
+        best_value, best_move = -INFINITO, moves[0]
+        for edge in moves:
+            value = self._child_value(edge, depth, alpha, beta)
+            if value > best_value:
+                best_value, best_move = value, edge
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best_value <= original_alpha:
+            kind = COTA_SUPERIOR
+        elif best_value >= beta:
+            kind = COTA_INFERIOR
+        else:
+            kind = EXACTO
+        # Reemplazo: se conserva la entrada previa sólo si es de esta búsqueda y más profunda
+        if entry is None or entry[5] != self.age or entry[1] <= depth:
+            self.table[slot] = (self.lines, depth, best_value, kind, best_move, self.age)
+        return best_value
+
+    def _make(self, edge):
+        """Traza una línea en el estado de búsqueda y retorna cuántos cuadros completa"""
+        self.lines |= 1 << edge
+        self.drawn[edge] = 1
+        self.free_lines -= 1
+        self.hash ^= self.zobrist[edge]
+        captured = 0
+        for box in self.edge_boxes[edge]:
+            self.sides[box] += 1
+            if self.sides[box] == 4:
+                captured += 1
+        self.remaining -= captured
+        return captured
+
+    def _unmake(self, edge):
+        """Deshace _make"""
+        self.lines ^= 1 << edge
+        self.drawn[edge] = 0
+        self.free_lines += 1
+        self.hash ^= self.zobrist[edge]
+        for box in self.edge_boxes[edge]:
+            if self.sides[box] == 4:
+                self.remaining += 1
+            self.sides[box] -= 1
+
+    def _classify(self):
+        """Clasifica las líneas libres en completar, seguras y peligrosas"""
+        completing, safe, dangerous = [], [], []
+        sides, drawn = self.sides, self.drawn
+        for edge in range(self.num_lines):
+            if drawn[edge]:
+                continue
+            worst = max(sides[box] for box in self.edge_boxes[edge])
+            if worst == 3:
+                completing.append(edge)
+            elif worst == 2:
+                dangerous.append(edge)
+            else:
+                safe.append(edge)
+        return completing, safe, dangerous
+
+    # Evaluación
+
+    def _evaluate(self, safe):
+        """Evaluación estática de una posición sin capturas pendientes"""
+        if safe:
+            return 0
+        components = self.chains()
+        if components is None:
+            return 0
+        return valor_cadenas(components)
+
+    def chains(self):
+        """
+        Descompone el tablero en cadenas y ciclos de cuadros con 2 lados trazados.
+
+        Retorna una tupla ordenada de pares (es_ciclo, longitud), o None si algún
+        cuadro libre tiene menos de 2 lados (el final no es "simple").
+        """
+        sides = self.sides
+        seen = bytearray(self.num_boxes)
+        components = []
+        for start in range(self.num_boxes):
+            if sides[start] == 4 or seen[start]:
+                continue
+            if sides[start] != 2:
+                return None
+            seen[start] = 1
+            stack = [start]
+            length, grounded = 0, False
+            while stack:
+                box = stack.pop()
+                length += 1
+                for edge in self.box_edges[box]:
+                    if self.drawn[edge]:
+                        continue
+                    neighbours = self.edge_boxes[edge]
+                    if len(neighbours) == 1:
+                        grounded = True  # La línea da al borde del tablero
+                        continue
+                    other = neighbours[0] if neighbours[1] == box else neighbours[1]
+                    if sides[other] != 2:
+                        return None
+                    if not seen[other]:
+                        seen[other] = 1
+                        stack.append(other)
+            components.append((not grounded, length))
+        return tuple(sorted(components))
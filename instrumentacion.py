@@ -0,0 +1,155 @@
+"""
+Instrumentación opcional de las rutas críticas de ambos juegos.
+
+Al activarla se reemplazan en sus clases los métodos a medir por envolturas que
+cuentan las llamadas y acumulan su tiempo (y, en la búsqueda, los nodos
+visitados); opcionalmente también corre cProfile. Si no se activa no se toca
+ningún método, así que el costo es nulo.
+
+Se activa con la opción --perfil de timbiriche.py y palillos.py o con la
+variable de entorno JUEGOS_PERFIL:
+
+    JUEGOS_PERFIL=1 python timbiriche.py              # sólo estadísticas
+    python timbiriche.py --perfil timbiriche.prof     # además, volcado de cProfile
+
+Al salir del programa se imprime el resumen en la salida de errores.
+"""
+import atexit
+import cProfile
+import functools
+import os
+import sys
+import time
+
+VARIABLE = "JUEGOS_PERFIL"
+
+
+class Estadisticas:
+    """Llamadas, tiempo acumulado y máximo, y nodos de búsqueda por método instrumentado"""
+
+    def __init__(self):
+        self.metodos = {}  # Nombre -> [llamadas, segundos, máximo en segundos, nodos]
+
+    def registrar(self, nombre, segundos, nodos=0):
+        datos = self.metodos.get(nombre)
+        if datos is None:
+            datos = self.metodos[nombre] = [0, 0.0, 0.0, 0]
+        datos[0] += 1
+        datos[1] += segundos
+        if segundos > datos[2]:
+            datos[2] = segundos
+        datos[3] += nodos
+
+    def reiniciar(self):
+        self.metodos.clear()
+
+    def resumen(self):
+        """Estadísticas por método, con tiempos en milisegundos (total) y microsegundos (por llamada)"""
+        resumen = {}
+        for nombre, (llamadas, segundos, maximo, nodos) in self.metodos.items():
+            resumen[nombre] = {
+                "llamadas": llamadas,
+                "total_ms": round(segundos * 1000, 3),
+                "promedio_us": round(segundos / llamadas * 1e6, 3),
+                "maximo_us": round(maximo * 1e6, 3),
+            }
+            if nodos:
+                resumen[nombre]["nodos"] = nodos
+                resumen[nombre]["nodos_por_segundo"] = round(nodos / segundos) if segundos else None
+        return resumen
+
+    def reporte(self):
+        """Tabla de texto con el resumen, de mayor a menor tiempo total"""
+        filas = sorted(self.resumen().items(), key=lambda item: -item[1]["total_ms"])
+        lineas = [f"{'método':<40}{'llamadas':>10}{'total ms':>12}{'prom. µs':>12}{'máx. µs':>12}{'nodos':>12}"]
+        for nombre, datos in filas:
+            lineas.append(f"{nombre:<40}{datos['llamadas']:>10}{datos['total_ms']:>12.3f}"
+                          f"{datos['promedio_us']:>12.3f}{datos['maximo_us']:>12.3f}{datos.get('nodos', ''):>12}")
+        return "\n".join(lineas)
+
+
+ESTADISTICAS = Estadisticas()
+_perfilador = None  # cProfile activo, si se pidió
+
+
+def _envolver(funcion, nombre, nodos):
+    """Envoltura que mide cada llamada; si nodos es True suma también self.nodes"""
+    reloj = time.perf_counter
+    registrar = ESTADISTICAS.registrar
+
+    @functools.wraps(funcion)
+    def envoltura(self, *args, **kwargs):
+        t = reloj()
+        try:
+            return funcion(self, *args, **kwargs)
+        finally:
+            registrar(nombre, reloj() - t, self.nodes if nodos else 0)
+
+    envoltura.instrumentada = True
+    return envoltura
+
+
+def instrumentar(clase, *metodos, nodos=False):
+    """Reemplaza los métodos de la clase por versiones medidas (una sola vez por método)"""
+    for metodo in metodos:
+        funcion = clase.__dict__.get(metodo)
+        if funcion is None or getattr(funcion, "instrumentada", False):
+            continue  # Heredado (se mide en la clase base) o ya instrumentado
+        setattr(clase, metodo, _envolver(funcion, f"{clase.__name__}.{metodo}", nodos))
+
+
+def activar(perfil=None):
+    """
+    Instrumenta los motores de ambos juegos y, si se da un archivo, corre
+    cProfile y lo vuelca ahí al salir. Retorna el objeto de estadísticas.
+    """
+    global _perfilador
+    from ia_timbiriche import BuscadorTimbiriche
+    from motor_palillos import JuegoPalillos
+    from motor_timbiriche import TableroTimbiriche
+
+    instrumentar(TableroTimbiriche, "get_available_lines", "check_square")
+    try:
+        from motor_numpy import TableroNumpy
+    except ImportError:
+        pass  # Sin NumPy no hay motor vectorizado que medir
+    else:
+        instrumentar(TableroNumpy, "get_available_lines", "check_square")
+    instrumentar(BuscadorTimbiriche, "search", nodos=True)
+    instrumentar(JuegoPalillos, "tomar_programa")
+
+    if perfil and _perfilador is None:
+        _perfilador = cProfile.Profile()
+        _perfilador.enable()
+        atexit.register(_volcar_perfil, perfil)
+    if not getattr(activar, "reporte_registrado", False):
+        atexit.register(lambda: print(ESTADISTICAS.reporte(), file=sys.stderr))
+        activar.reporte_registrado = True
+    return ESTADISTICAS
+
+
+def _volcar_perfil(ruta):
+    _perfilador.disable()
+    _perfilador.dump_stats(ruta)
+    print(f"Perfil de cProfile escrito en {ruta}", file=sys.stderr)
+
+
+def configurar(opcion, clase=None, metodos=()):
+    """
+    Activa la instrumentación si se pidió con la opción --perfil (opcion es None
+    si no se dio, "" si se dio sin archivo) o con la variable JUEGOS_PERFIL
+    ("1" para sólo estadísticas, cualquier otro valor es el archivo de cProfile).
+    Además instrumenta los métodos dados de la clase de la interfaz.
+
+    Retorna las estadísticas, o None si la instrumentación sigue apagada.
+    """
+    if opcion is None:
+        opcion = os.environ.get(VARIABLE, "")
+        if opcion in ("", "0"):
+            return None
+        if opcion == "1":
+            opcion = ""
+    estadisticas = activar(opcion or None)
+    if clase is not None:
+        instrumentar(clase, *metodos)
+    return estadisticas
@@ -0,0 +1,241 @@
+import argparse
+import random
+
+import numpy as np
+
+from motor_timbiriche import COMPLETING, DANGEROUS, DRAWN, SAFE, TableroTimbiriche, _ConjuntoIndexado
+
+
+class TableroNumpy(TableroTimbiriche):
+    """
+    Variante del motor para tableros muy grandes.
+
+    Todo el estado vive en arreglos de NumPy, sin las tablas de adyacencia ni la
+    máscara de bits del motor base, así que crear el tablero sólo reserva unos
+    cuantos arreglos:
+
+    - drawn: líneas trazadas, primero las horizontales y luego las verticales
+      (mismos índices que el motor base); horizontal_lines y vertical_lines son
+      vistas de forma (size, grid_size) y (grid_size, size).
+    - sides_grid: lados trazados de cada cuadro, de forma (grid_size, grid_size).
+    - category: categoría de cada línea (SAFE, DANGEROUS, COMPLETING o DRAWN).
+
+    Las casillas sueltas se leen y escriben con vistas de memoria, tan rápido como
+    un bytearray. Al trazar una línea se reclasifican sólo las líneas de sus
+    cuadros y se llevan las cuentas por categoría; las que completan un cuadro
+    (pocas) están en un conjunto y las seguras y peligrosas se eligen al azar por
+    rechazo sobre un arreglo de candidatas. Como los lados de un cuadro sólo
+    crecen, una línea sólo pasa de segura a peligrosa y a completar, así que ese
+    arreglo sigue cubriendo a su categoría mientras ésta no gane líneas. La
+    clasificación completa se obtiene comparando el arreglo de categorías y se
+    guarda hasta la siguiente jugada.
+    """
+
+    def __init__(self, size=5, on_game_over=None):
+        """Mismos parámetros que TableroTimbiriche"""
+        self.size = max(5, size)        # Asegura que el tamaño mínimo sea 5x5
+        self.grid_size = self.size - 1  # Número de cuadros por lado
+        self.num_horizontal = self.size * self.grid_size
+        self.num_lines = 2 * self.num_horizontal
+        self.num_boxes = self.grid_size * self.grid_size
+
+        self.drawn = np.zeros(self.num_lines, dtype=bool)
+        self.horizontal_lines = self.drawn[:self.num_horizontal].reshape(self.size, self.grid_size)
+        self.vertical_lines = self.drawn[self.num_horizontal:].reshape(self.grid_size, self.size)
+        self.sides_grid = np.zeros((self.grid_size, self.grid_size), dtype=np.uint8)
+        self.category = np.full(self.num_lines, SAFE, dtype=np.uint8)
+        self.owners = np.zeros(self.num_boxes, dtype=np.uint8)  # Dueño de cada cuadro (0 = libre)
+        self._drawn = memoryview(self.drawn)                 # Acceso a casillas sueltas
+        self._sides = memoryview(self.sides_grid).cast("B")  # Por índice de cuadro
+        self._categories = memoryview(self.category)
+
+        self.current_player = 1         # Jugador actual, empieza en 1
+        self.score = {1: 0, 2: 0}       # Puntaje de ambos jugadores
+        self.remaining_boxes = self.num_boxes  # Cuadros que faltan por completar
+        self.on_game_over = on_game_over
+
+        self.counts = [self.num_lines, 0, 0]    # Líneas seguras, peligrosas y que completan
+        self.completing = _ConjuntoIndexado()   # Líneas que completan un cuadro
+        # Candidatas de las seguras y las peligrosas: [arreglo, cuántas son válidas]
+        self.candidates = {SAFE: [np.arange(self.num_lines, dtype=np.int32), self.num_lines], DANGEROUS: None}
+        self._masks = None              # Clasificación vectorizada, hasta la siguiente jugada
+
+    @property
+    def lines(self):
+        """Máscara de bits de las líneas trazadas, como en el motor base"""
+        return int.from_bytes(np.packbits(self.drawn, bitorder="little").tobytes(), "little")
+
+    @property
+    def sides(self):
+        """Lados trazados de cada cuadro, como bytes en el orden de los índices de cuadro"""
+        return self.sides_grid.tobytes()
+
+    # Reglas
+
+    def is_drawn(self, edge):
+        """Verifica si una línea ya fue trazada"""
+        return self._drawn[edge]
+
+    def get_available_lines(self):
+        """Obtiene los índices de todas las líneas que faltan por trazar"""
+        return np.flatnonzero(~self.drawn).tolist()
+
+    def possible_squares(self, edge):
+        """Obtiene los cuadros (1 o 2) que podrían completarse con la línea dada"""
+        grid_size = self.grid_size
+        if edge < self.num_horizontal:
+            # La horizontal r * grid_size + c es el lado de arriba del cuadro (r, c)
+            if edge < grid_size:
+                return (edge,)
+            if edge >= self.num_boxes:
+                return (edge - grid_size,)
+            return (edge - grid_size, edge)
+        r, c = divmod(edge - self.num_horizontal, self.size)
+        box = r * grid_size + c
+        if c == 0:
+            return (box,)
+        if c == grid_size:
+            return (box - 1,)
+        return (box - 1, box)
+
+    def _box_edges(self, box):
+        """Índices de las 4 líneas de un cuadro (arriba, abajo, izquierda, derecha)"""
+        r, c = divmod(box, self.grid_size)
+        izquierda = self.num_horizontal + r * self.size + c
+        return box, box + self.grid_size, izquierda, izquierda + 1
+
+    def box_sides(self, box):
+        """Número de lados ya trazados de un cuadro"""
+        return self._sides[box]
+
+    def check_square(self, edge):
+        """Retorna los cuadros que quedan completos alrededor de la línea dada"""
+        return [box for box in self.possible_squares(edge) if self._sides[box] == 4]
+
+    def _update_counters(self, edge):
+        """Marca la línea, suma el lado a sus cuadros y reclasifica las líneas libres de esos cuadros"""
+        sides, categories = self._sides, self._categories
+        self._drawn[edge] = True
+        self._set_category(edge, DRAWN)
+        self._masks = None
+        boxes = self.possible_squares(edge)
+        for box in boxes:
+            sides[box] += 1
+        # Dos cuadros vecinos sólo comparten la línea trazada: cada línea libre se visita una vez
+        for box in boxes:
+            for other in self._box_edges(box):
+                if categories[other] != DRAWN:
+                    neighbours = self.possible_squares(other)
+                    worst = sides[neighbours[0]] if len(neighbours) == 1 else \
+                        max(sides[neighbours[0]], sides[neighbours[1]])
+                    self._set_category(other, COMPLETING if worst == 3 else DANGEROUS if worst == 2 else SAFE)
+
+    def _set_category(self, edge, new):
+        """Cambia la categoría de una línea y actualiza las cuentas y el conjunto de las que completan"""
+        old = self._categories[edge]
+        if old == new:
+            return
+        self._categories[edge] = new
+        if old != DRAWN:
+            self.counts[old] -= 1
+        if new != DRAWN:
+            self.counts[new] += 1
+        if old == COMPLETING:
+            self.completing.discard(edge)
+        if new == COMPLETING:
+            self.completing.add(edge)
+        elif new == DANGEROUS:
+            self.candidates[DANGEROUS] = None  # Las peligrosas ganaron una línea: hay que recalcularlas
+
+    # Estrategia
+
+    def _category_masks(self):
+        """Máscaras booleanas (completar, seguras, peligrosas) sobre todas las líneas"""
+        if self._masks is None:
+            self._masks = tuple(self.category == category for category in (COMPLETING, SAFE, DANGEROUS))
+        return self._masks
+
+    def classify_lines(self):
+        """
+        Clasifica las líneas disponibles en las mismas tres listas que el motor
+        base: las que completan un cuadro, las seguras y las peligrosas.
+        """
+        return tuple(np.flatnonzero(mask).tolist() for mask in self._category_masks())
+
+    def safe_count(self):
+        """Número de líneas seguras disponibles"""
+        return self.counts[SAFE]
+
+    def choose_line(self, rng=random):
+        """Estrategia voraz: completa un cuadro si puede, si no una línea segura y, si no, una peligrosa"""
+        if self.completing:
+            return self.completing.choice(rng)
+        for category in (SAFE, DANGEROUS):
+            if self.counts[category]:
+                return self._sample(category, rng)
+        return None
+
+    def _sample(self, category, rng):
+        """
+        Elige al azar una línea de la categoría: se sortea entre las candidatas y
+        las que ya no pertenecen se descartan del arreglo. Si menos de la mitad
+        de las candidatas siguen siendo válidas, se recalculan con las máscaras.
+        """
+        entry = self.candidates[category]
+        if entry is None or 2 * self.counts[category] < entry[1]:
+            candidates = np.flatnonzero(self._category_masks()[(COMPLETING, SAFE, DANGEROUS).index(category)])
+            entry = self.candidates[category] = [candidates.astype(np.int32), len(candidates)]
+        candidates, valid = entry
+        while True:
+            i = rng.randrange(valid)
+            edge = int(candidates[i])
+            if self._categories[edge] == category:
+                entry[1] = valid
+                return edge
+            valid -= 1
+            candidates[i] = candidates[valid]
+
+
+def comparar_motores(size, partidas, semilla=0):
+    """
+    Juega partidas al azar en paralelo sobre ambos motores y verifica en cada
+    jugada que coincidan las líneas disponibles, su clasificación, la máscara de
+    líneas, los lados de los cuadros y el puntaje.
+
+    Retorna el número de jugadas comparadas; lanza AssertionError si difieren.
+    """
+    jugadas = 0
+    for partida in range(partidas):
+        rng = random.Random(semilla + partida)
+        base, vectorizado = TableroTimbiriche(size), TableroNumpy(size)
+        while not base.is_over():
+            disponibles = base.get_available_lines()
+            assert vectorizado.get_available_lines() == disponibles, f"partida {partida}: líneas disponibles"
+            clasificadas = tuple(sorted(lineas) for lineas in base.classify_lines())
+            assert vectorizado.classify_lines() == clasificadas, f"partida {partida}: clasificación"
+            assert vectorizado.safe_count() == base.safe_count(), f"partida {partida}: líneas seguras"
+            # La jugada voraz puede diferir, pero debe ser de la misma categoría que elegiría el motor base
+            voraz = vectorizado.choose_line(rng)
+            categoria = next(lineas for lineas in clasificadas if lineas)
+            assert voraz in categoria, f"partida {partida}: jugada voraz"
+            edge = rng.choice(disponibles)
+            assert vectorizado.possible_squares(edge) == base.possible_squares(edge), f"partida {partida}: vecinos"
+            assert sorted(vectorizado.add_line(edge)) == sorted(base.add_line(edge)), f"partida {partida}: cuadros"
+            assert vectorizado.is_drawn(edge) and vectorizado.lines == base.lines, f"partida {partida}: líneas"
+            assert vectorizado.sides == bytes(base.sides), f"partida {partida}: lados"
+            assert vectorizado.score == base.score, f"partida {partida}: puntaje"
+            assert vectorizado.current_player == base.current_player, f"partida {partida}: turno"
+            jugadas += 1
+        assert vectorizado.is_over() and vectorizado.winner() == base.winner(), f"partida {partida}: resultado"
+    return jugadas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifica que el motor con NumPy coincida con el motor base")
+    parser.add_argument("--sizes", type=int, nargs="+", default=(5, 6, 9), help="Tamaños de tablero a verificar")
+    parser.add_argument("--partidas", type=int, default=50, help="Partidas al azar por tamaño")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+    for size in args.sizes:
+        jugadas = comparar_motores(size, args.partidas, args.semilla)
+        print(f"size={size}: {args.partidas} partidas, {jugadas} jugadas iguales en ambos motores")
@@ -0,0 +1,71 @@
+"""
+Reglas del juego de los Palillos sin interfaz gráfica.
+
+Cada partida es un objeto pequeño (sólo cuatro atributos en __slots__), así que
+un mismo proceso puede llevar decenas de miles de partidas a la vez; la
+estrategia del programa se comparte entre todas (ver nim.juego_palillos).
+"""
+import random
+
+from nim import juego_palillos
+
+
+class JuegoPalillos:
+    """
+    Partida de Palillos: en cada turno se toman de 1 a maximo palillos y gana
+    quien toma el último. Empieza el jugador 1.
+    """
+
+    __slots__ = ("palillos", "maximo", "turno", "ganador")
+
+    def __init__(self, palillos, maximo):
+        """
+        Parámetros:
+        - palillos: cantidad inicial de palillos.
+        - maximo: máxima cantidad de palillos por turno.
+        """
+        if palillos <= 0 or maximo <= 0:
+            raise ValueError("Los valores deben ser mayores que cero.")
+        self.palillos = palillos  # Palillos restantes
+        self.maximo = maximo
+        self.turno = 1            # Jugador en turno (1 o 2)
+        self.ganador = None       # Jugador que tomó el último palillo
+
+    def terminado(self):
+        return self.ganador is not None
+
+    def limite(self):
+        """Máximo de palillos que se pueden tomar en el turno actual"""
+        return min(self.maximo, self.palillos)
+
+    def tomar(self, cantidad):
+        """
+        Quita palillos en nombre del jugador en turno y pasa el turno.
+
+        Retorna el ganador si con esta jugada termina la partida, o None.
+        Lanza ValueError si la jugada no es válida.
+        """
+        if self.ganador is not None:
+            raise ValueError("La partida ya terminó.")
+        if not 1 <= cantidad <= self.limite():
+            raise ValueError(f"Debes tomar entre 1 y {self.limite()} palillos.")
+        self.palillos -= cantidad
+        if self.palillos == 0:
+            self.ganador = self.turno
+        else:
+            self.turno = 3 - self.turno
+        return self.ganador
+
+    def jugada_programa(self, rng=random):
+        """
+        Cantidad que tomaría el programa: la jugada ganadora del juego de
+        sustracción si existe y, si no, una cantidad aleatoria válida.
+        """
+        _, cantidad = juego_palillos(self.maximo).jugada([self.palillos], rng)
+        return cantidad
+
+    def tomar_programa(self, rng=random):
+        """Juega el turno actual con la estrategia del programa y retorna la cantidad tomada"""
+        cantidad = self.jugada_programa(rng)
+        self.tomar(cantidad)
+        return cantidad
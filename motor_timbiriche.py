@@ -0,0 +1,331 @@
+import math
+import random
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _tablas(size):
+    """
+    Precalcula las tablas de adyacencia de un tablero de size x size puntos.
+
+    Se calculan una sola vez por tamaño y se comparten entre todas las partidas.
+
+    Retorna:
+    - box_edges: tupla con los índices de las 4 líneas de cada cuadro.
+    - edge_boxes: tupla con los cuadros (1 o 2) que toca cada línea.
+    """
+    grid_size = size - 1
+    horizontales = size * grid_size
+    num_lines = 2 * horizontales
+
+    box_edges = []
+    for r in range(grid_size):
+        for c in range(grid_size):
+            arriba = r * grid_size + c
+            abajo = (r + 1) * grid_size + c
+            izquierda = horizontales + r * size + c
+            derecha = izquierda + 1
+            box_edges.append((arriba, abajo, izquierda, derecha))
+
+    edge_boxes = [[] for _ in range(num_lines)]
+    for box, edges in enumerate(box_edges):
+        for edge in edges:
+            edge_boxes[edge].append(box)
+
+    return tuple(box_edges), tuple(tuple(b) for b in edge_boxes)
+
+
+@lru_cache(maxsize=None)
+def _mascaras_cajas(size):
+    """
+    Máscara de bits con las 4 líneas de cada cuadro.
+
+    Cada máscara ocupa tantos bits como líneas tiene el tablero, así que sólo se
+    calculan bajo demanda (tablas de finales de tableros pequeños).
+    """
+    box_edges, _ = _tablas(size)
+    return tuple(sum(1 << e for e in edges) for edges in box_edges)
+
+
+# Categorías de las líneas disponibles según los cuadros vecinos
+SAFE, DANGEROUS, COMPLETING, DRAWN = 0, 1, 2, 3
+
+
+class _ConjuntoIndexado:
+    """
+    Conjunto de enteros con inserción, borrado y elección aleatoria en O(1).
+
+    Los elementos viven en una lista y un diccionario guarda su posición; al
+    borrar se intercambia el elemento con el último de la lista.
+    """
+
+    __slots__ = ("items", "pos")
+
+    def __init__(self, items=()):
+        self.items = list(items)
+        self.pos = {item: i for i, item in enumerate(self.items)}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.pos
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add(self, item):
+        if item not in self.pos:
+            self.pos[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item):
+        i = self.pos.pop(item, None)
+        if i is None:
+            return
+        last = self.items.pop()
+        if i < len(self.items):
+            self.items[i] = last
+            self.pos[last] = i
+
+    def choice(self, rng=random):
+        return self.items[rng.randrange(len(self.items))]
+
+
+class TableroTimbiriche:
+    """
+    Motor del Timbiriche sin dependencia de tkinter.
+
+    Las líneas se identifican con índices enteros y las líneas trazadas se
+    guardan en una máscara de bits (self.lines). Para un tablero de size x size
+    puntos y grid_size = size - 1:
+
+    - Línea horizontal (fila r, columna c), r en [0, size), c en [0, grid_size):
+      índice r * grid_size + c, une los puntos (c, r) y (c + 1, r).
+    - Línea vertical (fila r, columna c), r en [0, grid_size), c en [0, size):
+      índice size * grid_size + r * size + c, une los puntos (c, r) y (c, r + 1).
+    - Cuadro (fila r, columna c): índice r * grid_size + c.
+
+    Además se mantiene, de forma incremental, el número de lados trazados de
+    cada cuadro y la categoría de cada línea disponible (completa un cuadro,
+    segura o peligrosa), de modo que trazar una línea y elegir la jugada de la
+    computadora cuesten O(1).
+    """
+
+    def __init__(self, size=5, on_game_over=None):
+        """
+        Parámetros:
+        - size: número de puntos por lado (mínimo de 5x5).
+        - on_game_over: función opcional que se llama como on_game_over(winner, score)
+          cuando se completa el último cuadro (winner es 0 en caso de empate).
+        """
+        self.size = max(5, size)        # Asegura que el tamaño mínimo sea 5x5
+        self.grid_size = self.size - 1  # Número de cuadros por lado
+        self.num_horizontal = self.size * self.grid_size
+        self.num_lines = 2 * self.num_horizontal
+        self.num_boxes = self.grid_size * self.grid_size
+        self.box_edges, self.edge_boxes = _tablas(self.size)
+
+        self.lines = 0                  # Máscara de bits de las líneas trazadas
+        self.owners = bytearray(self.num_boxes)  # Dueño de cada cuadro (0 = libre)
+        self.current_player = 1         # Jugador actual, empieza en 1
+        self.score = {1: 0, 2: 0}       # Puntaje de ambos jugadores
+        self.remaining_boxes = self.num_boxes  # Cuadros que faltan por completar
+        self.on_game_over = on_game_over
+
+        self.sides = bytearray(self.num_boxes)       # Lados trazados de cada cuadro
+        self._init_categories()
+
+    # Índices y coordenadas
+
+    def horizontal(self, r, c):
+        """Índice de la línea horizontal que sale del punto (c, r) hacia la derecha"""
+        return r * self.grid_size + c
+
+    def vertical(self, r, c):
+        """Índice de la línea vertical que sale del punto (c, r) hacia abajo"""
+        return self.num_horizontal + r * self.size + c
+
+    def endpoints(self, edge):
+        """Retorna los extremos de una línea como puntos (columna, fila)"""
+        if edge < self.num_horizontal:
+            r, c = divmod(edge, self.grid_size)
+            return (c, r), (c + 1, r)
+        r, c = divmod(edge - self.num_horizontal, self.size)
+        return (c, r), (c, r + 1)
+
+    def edge_between(self, point1, point2):
+        """Retorna el índice de la línea entre dos puntos adyacentes, o None si no lo son"""
+        (c1, r1), (c2, r2) = sorted((point1, point2))
+        if not (0 <= c1 < self.size and 0 <= r1 < self.size):
+            return None
+        if r1 == r2 and c2 == c1 + 1 and c2 < self.size:
+            return self.horizontal(r1, c1)
+        if c1 == c2 and r2 == r1 + 1 and r2 < self.size:
+            return self.vertical(r1, c1)
+        return None
+
+    def edge_near(self, x, y, tolerance=0.25):
+        """
+        Retorna en O(1) la línea más cercana al punto (x, y), dado en unidades de
+        la cuadrícula (columna, fila), o None si ninguna está a menos de tolerance.
+        """
+        best, best_distance = None, tolerance
+        # Línea horizontal de la fila más cercana, en la columna donde cae x
+        r, c = round(y), math.floor(x)
+        if 0 <= r < self.size and 0 <= c < self.grid_size and abs(y - r) <= best_distance:
+            best, best_distance = self.horizontal(r, c), abs(y - r)
+        # Línea vertical de la columna más cercana, en la fila donde cae y
+        r, c = math.floor(y), round(x)
+        if 0 <= r < self.grid_size and 0 <= c < self.size and abs(x - c) < best_distance:
+            best = self.vertical(r, c)
+        return best
+
+    # Reglas
+
+    def is_drawn(self, edge):
+        """Verifica si una línea ya fue trazada"""
+        return (self.lines >> edge) & 1 == 1
+
+    def get_available_lines(self):
+        """Obtiene los índices de todas las líneas que faltan por trazar"""
+        safe, dangerous, completing = self.by_category
+        return sorted([*safe, *dangerous, *completing])
+
+    def possible_squares(self, edge):
+        """Obtiene los cuadros (1 o 2) que podrían completarse con la línea dada"""
+        return self.edge_boxes[edge]
+
+    def box_sides(self, box):
+        """Número de lados ya trazados de un cuadro"""
+        return self.sides[box]
+
+    def check_square(self, edge):
+        """Retorna los cuadros que quedan completos alrededor de la línea dada"""
+        return [box for box in self.edge_boxes[edge] if self.sides[box] == 4]
+
+    def add_line(self, edge):
+        """
+        Traza una línea para el jugador actual y aplica las reglas del juego.
+
+        Si la línea completa uno o más cuadros, se asignan al jugador actual y
+        éste conserva el turno; si no, el turno pasa al otro jugador.
+
+        Retorna la lista de cuadros completados.
+        """
+        if self.is_drawn(edge):
+            raise ValueError(f"La línea {edge} ya fue trazada")
+        self._update_counters(edge)
+        completed_squares = self.check_square(edge)
+        if completed_squares:
+            for box in completed_squares:
+                self.owners[box] = self.current_player
+            self.score[self.current_player] += len(completed_squares)
+            self.remaining_boxes -= len(completed_squares)
+            if self.remaining_boxes == 0 and self.on_game_over is not None:
+                self.on_game_over(self.winner(), self.score)
+        else:
+            self.current_player = 3 - self.current_player
+        return completed_squares
+
+    def _init_categories(self):
+        """Crea los conjuntos de líneas por categoría (todas seguras al inicio)"""
+        self.category = bytearray(self.num_lines)    # Categoría de cada línea
+        self.by_category = (
+            _ConjuntoIndexado(range(self.num_lines)),  # SAFE
+            _ConjuntoIndexado(),                       # DANGEROUS
+            _ConjuntoIndexado(),                       # COMPLETING
+        )
+
+    def _update_counters(self, edge):
+        """Marca la línea como trazada, suma el lado a los cuadros vecinos y reclasifica las líneas afectadas"""
+        self.lines |= 1 << edge
+        sides = self.sides
+        for box in self.edge_boxes[edge]:
+            sides[box] += 1
+        self._reclassify(edge)
+
+    def _reclassify(self, edge):
+        """Marca la línea como trazada y reclasifica las líneas libres de sus cuadros"""
+        sides = self.sides
+        self._set_category(edge, DRAWN)
+        for box in self.edge_boxes[edge]:
+            for other in self.box_edges[box]:
+                if self.category[other] != DRAWN:
+                    worst = max(sides[b] for b in self.edge_boxes[other])
+                    self._set_category(other, COMPLETING if worst == 3 else DANGEROUS if worst == 2 else SAFE)
+
+    def _set_category(self, edge, category):
+        """Mueve una línea al conjunto de la categoría indicada"""
+        old = self.category[edge]
+        if old == category:
+            return
+        if old != DRAWN:
+            self.by_category[old].discard(edge)
+        if category != DRAWN:
+            self.by_category[category].add(edge)
+        self.category[edge] = category
+
+    def is_over(self):
+        """Verifica si ya se completaron todos los cuadros (y por tanto se trazaron todas las líneas)"""
+        return self.remaining_boxes == 0
+
+    def winner(self):
+        """Retorna el jugador ganador, 0 en caso de empate, o None si el juego no ha terminado"""
+        if not self.is_over():
+            return None
+        if self.score[1] == self.score[2]:
+            return 0
+        return max(self.score, key=self.score.get)
+
+    # Estrategia
+
+    def classify_lines(self):
+        """
+        Clasifica las líneas disponibles en tres listas:
+        - las que completan un cuadro (algún cuadro vecino tiene 3 lados),
+        - las seguras (ningún cuadro vecino queda con 3 lados),
+        - las peligrosas (le dejan un cuadro de 3 lados al rival).
+        """
+        safe, dangerous, completing = self.by_category
+        return list(completing), list(safe), list(dangerous)
+
+    def safe_count(self):
+        """Número de líneas seguras disponibles"""
+        return len(self.by_category[SAFE])
+
+    def choose_line(self, rng=random):
+        """
+        Estrategia voraz de la computadora: completa un cuadro si puede, si no
+        elige una línea segura y, como último recurso, una peligrosa.
+
+        Retorna el índice de la línea elegida, o None si no quedan líneas.
+        """
+        safe, dangerous, completing = self.by_category
+        for candidates in (completing, safe, dangerous):
+            if candidates:
+                return candidates.choice(rng)
+        return None
+
+
+# Tamaño de tablero (puntos por lado) a partir del cual se usa el motor con NumPy:
+# se crea al instante y ocupa mucho menos memoria, y desde unos 50 puntos por lado
+# también sus jugadas son más rápidas (medido con partidas voraces completas en
+# benchmark_timbiriche.py --numpy). None desactiva el motor con NumPy.
+UMBRAL_NUMPY = 50
+
+
+def crear_tablero(size=5, on_game_over=None, numpy_threshold=UMBRAL_NUMPY):
+    """
+    Crea el motor adecuado para el tamaño del tablero: TableroTimbiriche o, a
+    partir de numpy_threshold puntos por lado (None para no usarla) y si NumPy
+    está instalado, la variante con arreglos motor_numpy.TableroNumpy.
+    """
+    if numpy_threshold is not None and size >= numpy_threshold:
+        try:
+            from motor_numpy import TableroNumpy
+        except ImportError:
+            pass  # NumPy es opcional
+        else:
+            return TableroNumpy(size, on_game_over)
+    return TableroTimbiriche(size, on_game_over)
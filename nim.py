@@ -0,0 +1,196 @@
+import random
+from functools import lru_cache
+
+# Límite de valores que se precalculan buscando el periodo de la sucesión
+LIMITE_PRECALCULO = 1 << 16
+
+
+class JuegoSustraccion:
+    """
+    Juego de sustracción general: en cada turno se elige un montón y se quita de
+    él una cantidad perteneciente al conjunto de jugadas permitidas.
+
+    - En juego normal gana quien hace la última jugada.
+    - En juego misère pierde quien hace la última jugada.
+
+    Para un solo montón se usa la sucesión de valores de Sprague-Grundy (normal)
+    o de resultados ganador/perdedor (misère). Ambas dependen sólo de los últimos
+    max(jugadas) valores, así que son periódicas a partir de algún punto: al
+    detectar el periodo cualquier montón, aunque tenga millones de palillos, se
+    responde en O(1).
+    """
+
+    def __init__(self, jugadas, misere=False):
+        """
+        Parámetros:
+        - jugadas: cantidades que se pueden quitar de un montón (enteros positivos).
+        - misere: si es True, pierde quien toma el último palillo.
+        """
+        if isinstance(jugadas, range) and jugadas.start == 1 and jugadas.step == 1:
+            self.jugadas = jugadas  # De 1 a N: se guarda el rango, sin construir la lista
+        else:
+            self.jugadas = tuple(sorted(set(jugadas)))
+        if not self.jugadas or self.jugadas[0] < 1:
+            raise ValueError("Las jugadas permitidas deben ser enteros positivos")
+        self.misere = misere
+        self.maximo = self.jugadas[-1]
+
+        # Caso cerrado: quitar de 1 a N palillos (enteros distintos y ordenados desde 1)
+        self.consecutivas = self.jugadas[0] == 1 and self.maximo == len(self.jugadas)
+        if self.consecutivas:
+            self.jugadas = range(1, self.maximo + 1)
+        self.valores = []     # Valores calculados de la sucesión
+        self.preperiodo = None
+        self.periodo = None
+        if not self.consecutivas:
+            self._precalcular()
+
+    # Sucesión de un solo montón
+
+    def _siguiente(self):
+        """Calcula el siguiente valor de la sucesión a partir de los anteriores"""
+        n = len(self.valores)
+        anteriores = {self.valores[n - s] for s in self.jugadas if s <= n}
+        if self.misere:
+            # Sin jugadas posibles gana el jugador en turno; si no, gana si deja una posición perdedora
+            valor = 1 if not anteriores or 0 in anteriores else 0
+        else:
+            valor = 0  # mex: menor entero que no aparece entre las posiciones alcanzables
+            while valor in anteriores:
+                valor += 1
+        self.valores.append(valor)
+        return valor
+
+    def _precalcular(self):
+        """Calcula la sucesión hasta encontrar una ventana de max(jugadas) valores repetida"""
+        ventana = self.maximo
+        vistas = {}
+        while len(self.valores) < LIMITE_PRECALCULO:
+            self._siguiente()
+            inicio = len(self.valores) - ventana
+            if inicio < 0:
+                continue
+            clave = tuple(self.valores[inicio:])
+            if clave in vistas:
+                # La sucesión queda determinada por la ventana: desde aquí se repite
+                self.preperiodo = vistas[clave]
+                self.periodo = inicio - self.preperiodo
+                return
+            vistas[clave] = inicio
+
+    def valor(self, n):
+        """
+        Valor de un montón de n palillos: su número de Grundy en juego normal, o
+        1/0 (gana/pierde el jugador en turno) en juego misère.
+        """
+        if self.consecutivas:
+            resto = n % (self.maximo + 1)
+            if self.misere:
+                return 0 if resto == 1 else 1
+            return resto
+        if self.periodo is not None and n >= self.preperiodo:
+            n = self.preperiodo + (n - self.preperiodo) % self.periodo
+        while n >= len(self.valores):
+            self._siguiente()
+        return self.valores[n]
+
+    # Varios montones
+
+    def gana(self, montones):
+        """Verifica si el jugador en turno tiene estrategia ganadora"""
+        montones = tuple(montones)
+        if not self.misere:
+            total = 0
+            for n in montones:
+                total ^= self.valor(n)
+            return total != 0
+        if len(montones) == 1:
+            return self.valor(montones[0]) == 1
+        return self._gana_misere(tuple(sorted(m for m in montones if m >= self.jugadas[0])))
+
+    @lru_cache(maxsize=1 << 16)
+    def _gana_misere(self, montones):
+        """
+        Búsqueda memorizada para misère con varios montones.
+
+        No hay teoría de Grundy para misère en general, así que el costo crece con
+        el producto de los tamaños: sólo es práctico para posiciones pequeñas.
+        Los montones más chicos que la menor jugada no afectan y se descartan.
+        """
+        if not montones:
+            return True  # Nadie puede mover: el rival hizo la última jugada
+        for i, n in enumerate(montones):
+            for s in self.jugadas:
+                if s > n:
+                    break
+                resto = montones[:i] + ((n - s,) if n - s >= self.jugadas[0] else ()) + montones[i + 1:]
+                if not self._gana_misere(tuple(sorted(resto))):
+                    return True
+        return False
+
+    def jugada_ganadora(self, montones):
+        """
+        Retorna (índice del montón, cantidad a quitar) que deja al rival en una
+        posición perdedora, o None si la posición actual es perdedora.
+        """
+        montones = list(montones)
+        if not self.misere:
+            total = 0
+            for n in montones:
+                total ^= self.valor(n)
+            if total == 0:
+                return None
+            for i, n in enumerate(montones):
+                objetivo = total ^ self.valor(n)
+                if self.consecutivas:
+                    # Forma cerrada: el valor de n es n % (maximo + 1), basta quitar la diferencia
+                    if objetivo < self.valor(n):
+                        return i, self.valor(n) - objetivo
+                    continue
+                for s in self.jugadas:
+                    if s > n:
+                        break
+                    if self.valor(n - s) == objetivo:
+                        return i, s
+            return None
+
+        if self.consecutivas and len(montones) == 1:
+            # Forma cerrada: dejar al rival con un palillo más un múltiplo de maximo + 1
+            s = (montones[0] - 1) % (self.maximo + 1)
+            return (0, s) if 1 <= s <= montones[0] else None
+
+        for i, n in enumerate(montones):
+            for s in self.jugadas:
+                if s > n:
+                    break
+                montones[i] = n - s
+                perdedora = not self.gana(montones)
+                montones[i] = n
+                if perdedora:
+                    return i, s
+        return None
+
+    def jugada(self, montones, rng=random):
+        """
+        Elige la jugada del programa: la ganadora si existe y, en posiciones
+        perdedoras, una jugada válida al azar.
+
+        Retorna (índice del montón, cantidad a quitar), o None si no hay jugadas.
+        """
+        ganadora = self.jugada_ganadora(montones)
+        if ganadora is not None:
+            return ganadora
+        if self.consecutivas:
+            posibles = [i for i, n in enumerate(montones) if n > 0]
+            if not posibles:
+                return None
+            i = rng.choice(posibles)
+            return i, rng.randint(1, min(self.maximo, montones[i]))
+        posibles = [(i, s) for i, n in enumerate(montones) for s in self.jugadas if s <= n]
+        return rng.choice(posibles) if posibles else None
+
+
+@lru_cache(maxsize=256)
+def juego_palillos(maximo, misere=False):
+    """Juego de un montón donde se quitan de 1 a maximo palillos (compartido entre partidas)"""
+    return JuegoSustraccion(range(1, maximo + 1), misere)
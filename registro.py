@@ -0,0 +1,158 @@
+"""
+Registro de partidas en formato JSONL (una línea JSON por evento).
+
+Cada partida empieza con una cabecera que incluye la clave "juego", sigue con
+una línea por jugada y termina con el resultado:
+
+    {"juego": "timbiriche", "v": 1, "size": 5}
+    {"l": 17}                         <- índice de la línea trazada
+    ...
+    {"fin": {"ganador": 2, "puntaje": [7, 9]}}
+
+    {"juego": "palillos", "v": 1, "palillos": 21, "maximo": 3}
+    {"t": 2}                          <- palillos tomados en el turno
+    ...
+
+Los archivos sólo se abren para agregar, así que un mismo archivo puede guardar
+millones de partidas; la lectura es perezosa y nunca carga un archivo completo.
+"""
+import itertools
+import json
+
+from motor_palillos import JuegoPalillos
+from motor_timbiriche import crear_tablero
+
+VERSION = 1
+CLAVE_JUGADA = {"timbiriche": "l", "palillos": "t"}
+
+
+class RegistroPartida:
+    """Escribe una partida en un archivo de registro a medida que se juega"""
+
+    def __init__(self, archivo, juego, **datos):
+        """
+        Parámetros:
+        - archivo: ruta donde se agrega la partida, o un archivo de texto ya
+          abierto (por ejemplo, para escribir muchas partidas seguidas); en ese
+          caso no se cierra al terminar.
+        - juego: "timbiriche" o "palillos".
+        - datos: datos adicionales de la cabecera (tamaño del tablero, palillos, etc.).
+        """
+        if juego not in CLAVE_JUGADA:
+            raise ValueError(f"Juego desconocido: {juego}")
+        self.clave = CLAVE_JUGADA[juego]
+        self.propio = not hasattr(archivo, "write")
+        if self.propio:
+            archivo = open(archivo, "a", encoding="utf-8", buffering=1)  # Una escritura por línea
+        self.archivo = archivo
+        self._escribir({"juego": juego, "v": VERSION, **datos})
+
+    def _escribir(self, evento):
+        self.archivo.write(json.dumps(evento, separators=(",", ":")) + "\n")
+
+    def jugada(self, valor):
+        """Agrega una jugada: índice de línea (Timbiriche) o palillos tomados (Palillos)"""
+        self._escribir({self.clave: valor})
+
+    def terminar(self, **resultado):
+        """Agrega el resultado de la partida y cierra el archivo si lo abrió el registro"""
+        self._escribir({"fin": resultado})
+        self.close()
+
+    def close(self):
+        if self.propio and not self.archivo.closed:
+            self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Partida:
+    """
+    Partida leída de un registro. Iterarla produce sus jugadas de forma perezosa;
+    al terminar, resultado contiene el evento final (o None si la partida quedó
+    incompleta).
+    """
+
+    __slots__ = ("cabecera", "resultado", "_eventos")
+
+    def __init__(self, cabecera, eventos):
+        self.cabecera = cabecera
+        self.resultado = None
+        self._eventos = eventos
+
+    @property
+    def juego(self):
+        return self.cabecera["juego"]
+
+    def __iter__(self):
+        clave = CLAVE_JUGADA[self.juego]
+        for evento in self._eventos:
+            if "fin" in evento:
+                self.resultado = evento["fin"]
+            else:
+                yield evento[clave]
+
+
+def leer_partidas(ruta):
+    """
+    Generador de las partidas de un archivo de registro, en orden.
+
+    Las jugadas de cada partida se leen sólo al iterarla; si no se consumen, se
+    descartan al pedir la siguiente partida.
+    """
+    numero = -1
+
+    def partida_de(evento):
+        nonlocal numero
+        if "juego" in evento:
+            numero += 1
+        return numero
+
+    # Sin "with": una partida ya entregada sigue pudiendo leerse aunque se deje
+    # de iterar este generador; el archivo se cierra al terminarlo o cuando ya
+    # nadie lo usa
+    archivo = open(ruta, encoding="utf-8")
+    eventos = (json.loads(linea) for linea in archivo if linea.strip())
+    for _, grupo in itertools.groupby(eventos, partida_de):
+        cabecera = next(grupo)
+        if "juego" not in cabecera:
+            continue  # Eventos sueltos antes de la primera cabecera
+        yield Partida(cabecera, grupo)
+    archivo.close()
+
+
+def reproducir_timbiriche(partida):
+    """
+    Reproduce sin interfaz una partida de Timbiriche a máxima velocidad.
+
+    Genera (línea, cuadros completados, tablero) después de cada jugada; el
+    tablero es el mismo objeto durante toda la partida.
+    """
+    board = crear_tablero(partida.cabecera["size"])
+    for edge in partida:
+        yield edge, board.add_line(edge), board
+
+
+def reproducir_palillos(partida):
+    """
+    Reproduce sin interfaz una partida de Palillos.
+
+    Genera (jugador, palillos tomados, palillos restantes) por cada turno.
+    """
+    juego = JuegoPalillos(partida.cabecera["palillos"], partida.cabecera["maximo"])
+    for tomar in partida:
+        turno = juego.turno
+        juego.tomar(tomar)
+        yield turno, tomar, juego.palillos
+
+
+def avanzar(jugadas, n):
+    """Adelanta n jugadas de un generador de reproducción y retorna la última (o None)"""
+    ultima = None
+    for ultima in itertools.islice(jugadas, n):
+        pass
+    return ultima
@@ -0,0 +1,343 @@
+"""
+Servidor asyncio que hospeda partidas de Timbiriche y Palillos contra la
+computadora mediante un protocolo de líneas sobre TCP.
+
+Cada comando es una línea de texto y cada respuesta una línea JSON con "ok":
+
+    NUEVO palillos <palillos> <maximo>          -> {"ok": true, "sesion": 1, "estado": {...}}
+    NUEVO timbiriche <size> [nivel] [jugador]   -> la computadora juega primero si jugador es 2
+    JUGAR <sesion> <valor>                      -> palillos tomados o índice de línea; la
+                                                   respuesta incluye las jugadas de la computadora
+    ESTADO <sesion>
+    CERRAR <sesion>
+    METRICAS                                    -> sesiones, latencias y uso de CPU del servidor
+    SALIR
+
+Las sesiones pertenecen a la conexión que las creó y se liberan al cerrarla.
+Las jugadas de la computadora se calculan en un executor (hilos por defecto o
+procesos con --procesos), al que sólo se envía el tamaño del tablero y la
+máscara de líneas trazadas, así que una búsqueda lenta no detiene al resto de
+las sesiones. La memoria por sesión está acotada por el tamaño máximo del
+tablero y el número de sesiones por el límite del servidor.
+
+Ejemplo:
+    python servidor.py --puerto 8765 --procesos 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ia_timbiriche import NIVELES, BuscadorTimbiriche
+from motor_palillos import JuegoPalillos
+from motor_timbiriche import crear_tablero
+from tabla_finales import cargar_tabla
+
+PUERTO = 8765
+LINEA_MAXIMA = 256        # Bytes por comando
+TAMANO_MAXIMO = 20        # Puntos por lado de un tablero de Timbiriche
+MAX_SESIONES = 100000     # Sesiones abiertas en todo el servidor
+LATENCIAS_GUARDADAS = 10000  # Muestras de latencia para los percentiles
+
+
+def _nucleos():
+    """Núcleos disponibles para este proceso"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# Jugadas de la computadora (se ejecutan en el executor)
+
+_locales = threading.local()
+
+
+def _buscador(size, nivel):
+    """Buscador reutilizado por hilo o proceso, para no crear su tabla de transposición en cada jugada"""
+    buscadores = getattr(_locales, "buscadores", None)
+    if buscadores is None:
+        buscadores = _locales.buscadores = {}
+    clave = (size, nivel)
+    if clave not in buscadores:
+        tabla = cargar_tabla(size) if nivel else None
+        buscadores[clave] = BuscadorTimbiriche(size, nivel, endgame_table=tabla)
+    return buscadores[clave]
+
+
+def turno_timbiriche(size, nivel, lines):
+    """
+    Jugadas de la computadora en un tablero dado por su tamaño y la máscara de
+    líneas trazadas: sigue jugando mientras complete cuadros.
+    """
+    board = crear_tablero(size)
+    edge = 0
+    pendientes = lines
+    while pendientes:
+        if pendientes & 1:
+            board.add_line(edge)
+        pendientes >>= 1
+        edge += 1
+
+    ai = _buscador(size, nivel)
+    jugadas = []
+    while not board.is_over():
+        edge = ai.choose_line(board)
+        jugadas.append(edge)
+        if not board.add_line(edge):
+            break  # El turno pasa al usuario
+    return jugadas
+
+
+def turno_palillos(palillos, maximo):
+    """Palillos que toma la computadora con la estrategia de tomar_programa"""
+    return JuegoPalillos(palillos, maximo).jugada_programa()
+
+
+class Sesion:
+    """Partida de un cliente: el motor del juego y, en Timbiriche, su jugador y nivel"""
+
+    __slots__ = ("tipo", "juego", "jugador", "nivel")
+
+    def __init__(self, tipo, juego, jugador=1, nivel=0):
+        self.tipo = tipo
+        self.juego = juego
+        self.jugador = jugador
+        self.nivel = nivel
+
+    def estado(self, lineas=False):
+        """Estado de la partida para la respuesta; la máscara de líneas sólo si se pide"""
+        juego = self.juego
+        if self.tipo == "palillos":
+            return {"palillos": juego.palillos, "turno": juego.turno, "ganador": juego.ganador}
+        estado = {"size": juego.size, "turno": juego.current_player,
+                  "puntaje": [juego.score[1], juego.score[2]], "ganador": juego.winner()}
+        if lineas:
+            estado["lineas"] = juego.lines
+        return estado
+
+
+class Conexion:
+    """Sesiones de una conexión, numeradas desde 1"""
+
+    __slots__ = ("sesiones", "siguiente")
+
+    def __init__(self):
+        self.sesiones = {}
+        self.siguiente = 1
+
+
+class ErrorComando(Exception):
+    """Comando inválido; su mensaje se envía al cliente"""
+
+
+class ServidorJuegos:
+    """Estado compartido del servidor: executor, límite de sesiones y métricas"""
+
+    def __init__(self, executor=None, max_sesiones=MAX_SESIONES):
+        """
+        Parámetros:
+        - executor: donde se calculan las jugadas de la computadora (por
+          defecto, un ThreadPoolExecutor).
+        - max_sesiones: sesiones abiertas permitidas en todo el servidor.
+        """
+        self.executor = executor or ThreadPoolExecutor()
+        self.max_sesiones = max_sesiones
+        self.sesiones = 0           # Sesiones abiertas
+        self.sesiones_pico = 0
+        self.conexiones = 0
+        self.comandos = 0
+        self.errores = 0
+        self.latencias = deque(maxlen=LATENCIAS_GUARDADAS)  # Segundos por comando
+        self.inicio = time.perf_counter()
+        self.cpu_inicio = time.process_time()
+
+    async def atender(self, reader, writer):
+        """Atiende una conexión: un comando por línea, en orden"""
+        conexion = Conexion()
+        self.conexiones += 1
+        try:
+            while True:
+                try:
+                    linea = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(b'{"ok":false,"error":"Comando demasiado largo"}\n')
+                    break
+                if not linea:
+                    break
+                t = time.perf_counter()
+                try:
+                    respuesta = await self.comando(linea.decode("utf-8", "replace").split(), conexion)
+                except ErrorComando as error:
+                    self.errores += 1
+                    respuesta = {"ok": False, "error": str(error)}
+                if respuesta is None:
+                    break           # SALIR
+                writer.write(json.dumps(respuesta, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+                self.comandos += 1
+                self.latencias.append(time.perf_counter() - t)
+        except ConnectionError:
+            pass
+        finally:
+            self.sesiones -= len(conexion.sesiones)
+            self.conexiones -= 1
+            writer.close()
+
+    async def comando(self, partes, conexion):
+        """Ejecuta un comando ya separado en palabras; retorna la respuesta o None para SALIR"""
+        if not partes:
+            raise ErrorComando("Comando vacío")
+        nombre, argumentos = partes[0].upper(), partes[1:]
+        try:
+            numeros = [int(a) for a in argumentos[1 if nombre == "NUEVO" else 0:]]
+        except ValueError:
+            raise ErrorComando("Los argumentos deben ser enteros") from None
+
+        if nombre == "NUEVO":
+            if not argumentos:
+                raise ErrorComando("Falta el juego: palillos o timbiriche")
+            return await self.nuevo(argumentos[0].lower(), numeros, conexion)
+        if nombre == "METRICAS":
+            return {"ok": True, "metricas": self.metricas()}
+        if nombre == "SALIR":
+            return None
+        if nombre not in ("JUGAR", "ESTADO", "CERRAR"):
+            raise ErrorComando(f"Comando desconocido: {nombre}")
+
+        sesiones = conexion.sesiones
+        if not numeros or numeros[0] not in sesiones:
+            raise ErrorComando("Sesión inexistente")
+        numero = numeros[0]
+        sesion = sesiones[numero]
+        if nombre == "ESTADO":
+            return {"ok": True, "sesion": numero, "estado": sesion.estado(lineas=True)}
+        if nombre == "CERRAR":
+            del sesiones[numero]
+            self.sesiones -= 1
+            return {"ok": True, "sesion": numero}
+        if len(numeros) != 2:
+            raise ErrorComando("Uso: JUGAR <sesion> <valor>")
+        jugadas = await self.jugar(sesion, numeros[1])
+        return {"ok": True, "sesion": numero, "computadora": jugadas, "estado": sesion.estado()}
+
+    async def nuevo(self, tipo, numeros, conexion):
+        """Crea una sesión y, si empieza la computadora, juega su primer turno"""
+        if self.sesiones >= self.max_sesiones:
+            raise ErrorComando("El servidor alcanzó el máximo de sesiones")
+        if tipo == "palillos":
+            if len(numeros) != 2:
+                raise ErrorComando("Uso: NUEVO palillos <palillos> <maximo>")
+            try:
+                sesion = Sesion(tipo, JuegoPalillos(*numeros))
+            except ValueError as error:
+                raise ErrorComando(str(error)) from None
+        elif tipo == "timbiriche":
+            size, nivel, jugador = (numeros + [5, 0, 1][len(numeros):])[:3]
+            if not 5 <= size <= TAMANO_MAXIMO:
+                raise ErrorComando(f"El tamaño debe estar entre 5 y {TAMANO_MAXIMO}")
+            if nivel not in NIVELES or jugador not in (1, 2):
+                raise ErrorComando(f"Nivel de 0 a {max(NIVELES)} y jugador 1 o 2")
+            sesion = Sesion(tipo, crear_tablero(size), jugador, nivel)
+        else:
+            raise ErrorComando(f"Juego desconocido: {tipo}")
+
+        numero = conexion.siguiente
+        conexion.siguiente += 1
+        conexion.sesiones[numero] = sesion
+        self.sesiones += 1
+        self.sesiones_pico = max(self.sesiones_pico, self.sesiones)
+        jugadas = await self.turno_computadora(sesion)
+        return {"ok": True, "sesion": numero, "computadora": jugadas, "estado": sesion.estado()}
+
+    async def jugar(self, sesion, valor):
+        """Aplica la jugada del usuario y retorna las jugadas con que responde la computadora"""
+        juego = sesion.juego
+        if sesion.tipo == "palillos":
+            try:
+                juego.tomar(valor)
+            except ValueError as error:
+                raise ErrorComando(str(error)) from None
+        else:
+            if juego.is_over():
+                raise ErrorComando("La partida ya terminó.")
+            if juego.current_player != sesion.jugador:
+                raise ErrorComando("No es tu turno")
+            if not 0 <= valor < juego.num_lines or juego.is_drawn(valor):
+                raise ErrorComando(f"La línea {valor} no está disponible")
+            juego.add_line(valor)
+        return await self.turno_computadora(sesion)
+
+    async def turno_computadora(self, sesion):
+        """Juega en el executor mientras sea el turno de la computadora"""
+        loop = asyncio.get_running_loop()
+        juego = sesion.juego
+        jugadas = []
+        if sesion.tipo == "palillos":
+            if not juego.terminado() and juego.turno == 2:
+                tomar = await loop.run_in_executor(self.executor, turno_palillos, juego.palillos, juego.maximo)
+                juego.tomar(tomar)
+                jugadas.append(tomar)
+            return jugadas
+        while not juego.is_over() and juego.current_player != sesion.jugador:
+            respuesta = await loop.run_in_executor(self.executor, turno_timbiriche,
+                                                   juego.size, sesion.nivel, juego.lines)
+            for edge in respuesta:
+                juego.add_line(edge)
+            jugadas.extend(respuesta)
+        return jugadas
+
+    def metricas(self):
+        """Sesiones, latencia por comando (milisegundos) y uso de CPU desde el arranque"""
+        segundos = time.perf_counter() - self.inicio
+        cpu = time.process_time() - self.cpu_inicio
+        nucleos = _nucleos()
+        latencias = sorted(self.latencias)
+        ultimo = len(latencias) - 1
+        percentiles = {f"p{p}": round(latencias[ultimo * p // 100] * 1000, 3) for p in (50, 90, 99)} if latencias else {}
+        return {
+            "sesiones": self.sesiones,
+            "sesiones_pico": self.sesiones_pico,
+            "conexiones": self.conexiones,
+            "comandos": self.comandos,
+            "errores": self.errores,
+            "latencia_ms": percentiles,
+            "comandos_por_segundo": round(self.comandos / segundos, 2),
+            "nucleos": nucleos,
+            "uso_cpu": round(cpu / segundos, 3),
+            "sesiones_por_nucleo": round(self.sesiones_pico / nucleos, 1),
+        }
+
+
+async def servir(host="127.0.0.1", puerto=PUERTO, procesos=0, max_sesiones=MAX_SESIONES):
+    """Arranca el servidor y atiende conexiones hasta que se cancele"""
+    executor = ProcessPoolExecutor(procesos) if procesos else ThreadPoolExecutor()
+    servidor = ServidorJuegos(executor, max_sesiones)
+    server = await asyncio.start_server(servidor.atender, host, puerto, limit=LINEA_MAXIMA)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de partidas de Timbiriche y Palillos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--procesos", type=int, default=0,
+                        help="Calcula las jugadas de la computadora en este número de procesos (0 = hilos)")
+    parser.add_argument("--max-sesiones", type=int, default=MAX_SESIONES, help="Sesiones abiertas permitidas")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.host, args.puerto, args.procesos, args.max_sesiones))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
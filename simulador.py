@@ -0,0 +1,214 @@
+"""
+Simulador de partidas computadora contra computadora para Timbiriche y Palillos.
+
+Reparte las partidas entre varios procesos, escribe el resultado de cada una
+como una línea JSON y al final reporta porcentajes de victoria, duración de las
+partidas y partidas por segundo.
+
+Con --registro también se guardan las jugadas de cada partida (ver registro.py).
+
+Ejemplos:
+    python simulador.py timbiriche --partidas 200 --size 5 --jugador1 nivel2 --jugador2 voraz
+    python simulador.py palillos --partidas 10000 --palillos 21 --maximo 3 --jugador2 aleatoria --registro palillos.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ia_timbiriche import BuscadorTimbiriche
+from motor_palillos import JuegoPalillos
+from motor_timbiriche import UMBRAL_NUMPY, crear_tablero
+from registro import RegistroPartida
+from tabla_finales import cargar_tabla
+
+# Estrategias disponibles para cada juego
+POLITICAS_TIMBIRICHE = {
+    "aleatoria": None,  # Cualquier línea disponible
+    "voraz": 0,         # Estrategia original de computer_turn
+    "nivel1": 1,
+    "nivel2": 2,
+    "nivel3": 3,
+}
+POLITICAS_PALILLOS = ("aleatoria", "estrategica")  # "estrategica" es la de tomar_programa
+
+
+def jugar_timbiriche(size, umbral_numpy, politicas, semilla, registro=None):
+    """
+    Juega una partida de Timbiriche entre dos estrategias y retorna su resultado.
+    Si se da una lista en registro, se le agrega cada línea trazada.
+    """
+    rng = random.Random(semilla)
+    board = crear_tablero(size, numpy_threshold=umbral_numpy)
+    jugadores = {}
+    for jugador, politica in zip((1, 2), politicas):
+        nivel = POLITICAS_TIMBIRICHE[politica]
+        if nivel is None:
+            jugadores[jugador] = None
+        else:
+            tabla = cargar_tabla(board.size) if nivel else None
+            jugadores[jugador] = BuscadorTimbiriche(board.size, nivel, rng=rng, endgame_table=tabla)
+
+    jugadas = 0
+    while not board.is_over():
+        ai = jugadores[board.current_player]
+        edge = rng.choice(board.get_available_lines()) if ai is None else ai.choose_line(board)
+        board.add_line(edge)
+        if registro is not None:
+            registro.append(edge)
+        jugadas += 1
+    return {"ganador": board.winner(), "puntaje": [board.score[1], board.score[2]], "jugadas": jugadas}
+
+
+def jugar_palillos(palillos, maximo, politicas, semilla, registro=None):
+    """
+    Juega una partida de Palillos (gana quien toma el último) y retorna su resultado.
+    Si se da una lista en registro, se le agregan los palillos tomados en cada turno.
+    """
+    rng = random.Random(semilla)
+    juego = JuegoPalillos(palillos, maximo)
+    jugadas = 0
+    while not juego.terminado():
+        if politicas[juego.turno - 1] == "estrategica":
+            tomar = juego.tomar_programa(rng)
+        else:
+            tomar = rng.randint(1, juego.limite())
+            juego.tomar(tomar)
+        if registro is not None:
+            registro.append(tomar)
+        jugadas += 1
+    return {"ganador": juego.ganador, "jugadas": jugadas}
+
+
+def _jugar_lote(juego, parametros, politicas, inicio, cantidad, semilla, registrar=False):
+    """Juega un lote de partidas consecutivas dentro de un proceso del grupo"""
+    resultados = []
+    for partida in range(inicio, inicio + cantidad):
+        t = time.perf_counter()
+        jugadas = [] if registrar else None
+        if juego == "timbiriche":
+            resultado = jugar_timbiriche(*parametros, politicas, semilla + partida, jugadas)
+        else:
+            resultado = jugar_palillos(*parametros, politicas, semilla + partida, jugadas)
+        if registrar:
+            resultado["registro"] = jugadas
+        resultado["partida"] = partida
+        resultado["segundos"] = round(time.perf_counter() - t, 6)
+        resultados.append(resultado)
+    return resultados
+
+
+def _registrar(registro, juego, parametros, politicas, semilla, resultado):
+    """Escribe en el archivo de registro una partida jugada por el simulador"""
+    if juego == "timbiriche":
+        cabecera = {"size": max(5, parametros[0])}
+    else:
+        cabecera = {"palillos": parametros[0], "maximo": parametros[1]}
+    partida = RegistroPartida(registro, juego, **cabecera, politicas=list(politicas),
+                              semilla=semilla + resultado["partida"])
+    for jugada in resultado.pop("registro"):
+        partida.jugada(jugada)
+    fin = {"ganador": resultado["ganador"]}
+    if "puntaje" in resultado:
+        fin["puntaje"] = resultado["puntaje"]
+    partida.terminar(**fin)
+
+
+def simular(juego, parametros, politicas, partidas, procesos=None, semilla=0, salida=sys.stdout, registro=None):
+    """
+    Juega las partidas repartidas en lotes sobre un ProcessPoolExecutor.
+
+    Escribe cada resultado como una línea JSON en cuanto termina su lote y
+    retorna el resumen de la simulación. Si se da un archivo abierto en
+    registro, también se escriben ahí las jugadas de cada partida.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    lote = max(1, min(100, partidas // (procesos * 4)))
+    victorias = {0: 0, 1: 0, 2: 0}
+    total_jugadas = 0
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        futuros = [
+            executor.submit(_jugar_lote, juego, parametros, politicas, i, min(lote, partidas - i), semilla,
+                            registro is not None)
+            for i in range(0, partidas, lote)
+        ]
+        for futuro in as_completed(futuros):
+            for resultado in futuro.result():
+                victorias[resultado["ganador"]] += 1
+                total_jugadas += resultado["jugadas"]
+                if registro is not None:
+                    _registrar(registro, juego, parametros, politicas, semilla, resultado)
+                salida.write(json.dumps(resultado) + "\n")
+            salida.flush()
+            if registro is not None:
+                registro.flush()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "juego": juego,
+        "politicas": list(politicas),
+        "partidas": partidas,
+        "procesos": procesos,
+        "victorias": {"jugador1": victorias[1] / partidas, "jugador2": victorias[2] / partidas,
+                      "empates": victorias[0] / partidas},
+        "jugadas_promedio": total_jugadas / partidas,
+        "segundos": round(segundos, 3),
+        "partidas_por_segundo": round(partidas / segundos, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulador de partidas entre estrategias de la computadora")
+    sub = parser.add_subparsers(dest="juego", required=True)
+
+    timbiriche = sub.add_parser("timbiriche", help="Partidas de Timbiriche")
+    timbiriche.add_argument("--size", type=int, default=5, help="Puntos por lado del tablero (mínimo 5)")
+    timbiriche.add_argument("--jugador1", choices=POLITICAS_TIMBIRICHE, default="voraz")
+    timbiriche.add_argument("--jugador2", choices=POLITICAS_TIMBIRICHE, default="voraz")
+    timbiriche.add_argument("--umbral-numpy", type=int, default=UMBRAL_NUMPY,
+                            help="Tamaño a partir del cual se usa el motor con NumPy, si está instalado (por defecto, %(default)s)")
+
+    palillos = sub.add_parser("palillos", help="Partidas de Palillos")
+    palillos.add_argument("--palillos", type=int, default=21, help="Cantidad inicial de palillos")
+    palillos.add_argument("--maximo", type=int, default=3, help="Máximo de palillos por turno")
+    palillos.add_argument("--jugador1", choices=POLITICAS_PALILLOS, default="estrategica")
+    palillos.add_argument("--jugador2", choices=POLITICAS_PALILLOS, default="estrategica")
+
+    for p in (timbiriche, palillos):
+        p.add_argument("--partidas", type=int, default=100, help="Número de partidas")
+        p.add_argument("--procesos", type=int, default=None, help="Procesos a usar (por defecto, todos los núcleos)")
+        p.add_argument("--semilla", type=int, default=0, help="Semilla base; la partida i usa semilla + i")
+        p.add_argument("--salida", default="-", help="Archivo JSONL de resultados ('-' para la salida estándar)")
+        p.add_argument("--registro", help="Agrega las jugadas de cada partida a este archivo de registro")
+    args = parser.parse_args(argv)
+    if args.partidas <= 0:
+        parser.error("El número de partidas debe ser mayor que cero.")
+
+    if args.juego == "timbiriche":
+        parametros = (args.size, args.umbral_numpy)
+    else:
+        if args.palillos <= 0 or args.maximo <= 0:
+            parser.error("Los valores deben ser mayores que cero.")
+        parametros = (args.palillos, args.maximo)
+    politicas = (args.jugador1, args.jugador2)
+
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+    registro = open(args.registro, "a", encoding="utf-8") if args.registro else None
+    try:
+        resumen = simular(args.juego, parametros, politicas, args.partidas, args.procesos, args.semilla,
+                          salida, registro)
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+        if registro is not None:
+            registro.close()
+    print(json.dumps(resumen, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Tabla de finales precalculada para tableros pequeños de Timbiriche.
+
+Para cada posición con a lo más max_libres líneas por trazar se guarda la mejor
+diferencia de cuadros (propios - rival) que puede asegurar el jugador en turno.
+Se calcula hacia atrás, de las posiciones con menos líneas libres a las de más,
+y cada clase de posiciones equivalentes por simetría del tablero se resuelve una
+sola vez.
+
+Las posiciones se indexan por el rango combinatorio (orden colexicográfico) del
+conjunto de líneas libres, así que el archivo no guarda claves: sólo un byte con
+signo por posición, capa tras capa. La lectura usa mmap y cada consulta es un
+único acceso a memoria.
+
+Ejemplo:
+    python tabla_finales.py --size 5 --max-libres 6
+"""
+import argparse
+import mmap
+import os
+import struct
+from functools import lru_cache
+from math import comb
+
+from motor_timbiriche import TableroTimbiriche, _mascaras_cajas, _tablas
+
+MAGIA = b"TBFN"
+VERSION = 1
+CABECERA = struct.Struct("<4sHHHH")  # magia, versión, size, líneas, max_libres
+DIRECTORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablas")
+
+
+def ruta_tabla(size, directorio=DIRECTORIO):
+    """Ruta por defecto de la tabla de un tamaño de tablero"""
+    return os.path.join(directorio, f"timbiriche_{size}.tb")
+
+
+@lru_cache(maxsize=None)
+def simetrias(size):
+    """
+    Permutaciones de líneas para las 8 simetrías del tablero cuadrado
+    (rotaciones y reflexiones), incluida la identidad.
+    """
+    board = TableroTimbiriche(size)
+    n = board.size - 1
+    transformaciones = (
+        lambda c, r: (c, r),
+        lambda c, r: (n - r, c),
+        lambda c, r: (n - c, n - r),
+        lambda c, r: (r, n - c),
+        lambda c, r: (n - c, r),
+        lambda c, r: (c, n - r),
+        lambda c, r: (r, c),
+        lambda c, r: (n - r, n - c),
+    )
+    permutaciones = []
+    for transformar in transformaciones:
+        permutacion = []
+        for edge in range(board.num_lines):
+            point1, point2 = board.endpoints(edge)
+            permutacion.append(board.edge_between(transformar(*point1), transformar(*point2)))
+        permutaciones.append(tuple(permutacion))
+    return tuple(permutaciones)
+
+
+def _bits(mask):
+    """Índices de los bits encendidos de mask, de menor a mayor"""
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
+
+
+def _rango(indices, binomiales):
+    """Rango colexicográfico de un conjunto dado como lista ordenada de índices"""
+    return sum(binomiales[e][i] for i, e in enumerate(indices, 1))
+
+
+def _tabla_binomiales(num_lines, max_libres):
+    """binomiales[n][k] = C(n, k) para n < num_lines y k <= max_libres"""
+    return [[comb(n, k) for k in range(max_libres + 1)] for n in range(num_lines)]
+
+
+def _desplazamientos(num_lines, max_libres):
+    """Posición en el archivo donde empieza cada capa (número de líneas libres)"""
+    desplazamientos, total = [], 0
+    for k in range(max_libres + 1):
+        desplazamientos.append(total)
+        total += comb(num_lines, k)
+    return desplazamientos, total
+
+
+def generar(size, max_libres, ruta=None):
+    """
+    Calcula la tabla por análisis retrógrado y la escribe en disco.
+
+    Retorna la ruta del archivo generado.
+    """
+    board = TableroTimbiriche(size)
+    size, num_lines = board.size, board.num_lines
+    if not 0 < max_libres <= num_lines:
+        raise ValueError(f"max_libres debe estar entre 1 y {num_lines}")
+    box_masks, (_, edge_boxes) = _mascaras_cajas(size), _tablas(size)
+    permutaciones = simetrias(size)[1:]
+    binomiales = _tabla_binomiales(num_lines, max_libres)
+    desplazamientos, total = _desplazamientos(num_lines, max_libres)
+    valores = bytearray(total)       # Valores con signo guardados como bytes
+    firmados = memoryview(valores).cast("b")
+
+    for k in range(1, max_libres + 1):
+        inicio, anterior = desplazamientos[k], desplazamientos[k - 1]
+        libres = (1 << k) - 1
+        fin = 1 << num_lines
+        rango = 0
+        while libres < fin:
+            indices = _bits(libres)
+            canonica = min(sum(1 << p[e] for e in indices) for p in permutaciones)
+            if canonica < libres:
+                # Una posición simétrica menor ya se resolvió (orden numérico = orden de rango)
+                firmados[inicio + rango] = firmados[inicio + _rango(_bits(canonica), binomiales)]
+            else:
+                mejor = -128
+                for j, edge in enumerate(indices):
+                    restantes = libres ^ (1 << edge)
+                    capturados = sum(1 for box in edge_boxes[edge] if box_masks[box] & restantes == 0)
+                    hijo = firmados[anterior + _rango(indices[:j] + indices[j + 1:], binomiales)]
+                    valor = capturados + hijo if capturados else -hijo
+                    if valor > mejor:
+                        mejor = valor
+                firmados[inicio + rango] = mejor
+            rango += 1
+            # Truco de Gosper: siguiente entero con k bits encendidos
+            low = libres & -libres
+            ripple = libres + low
+            libres = (((ripple ^ libres) >> 2) // low) | ripple
+
+    ruta = ruta or ruta_tabla(size)
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    with open(ruta, "wb") as f:
+        f.write(CABECERA.pack(MAGIA, VERSION, size, num_lines, max_libres))
+        f.write(valores)
+    return ruta
+
+
+class TablaFinales:
+    """Lectura de una tabla de finales mapeada en memoria"""
+
+    def __init__(self, ruta):
+        with open(ruta, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magia, version, self.size, self.num_lines, self.max_libres = CABECERA.unpack_from(self.mm)
+        if magia != MAGIA or version != VERSION:
+            self.mm.close()
+            raise ValueError(f"{ruta} no es una tabla de finales válida")
+        self.full_mask = (1 << self.num_lines) - 1
+        self.box_masks = _mascaras_cajas(self.size)
+        _, self.edge_boxes = _tablas(self.size)
+        self.binomiales = _tabla_binomiales(self.num_lines, self.max_libres)
+        self.desplazamientos, _ = _desplazamientos(self.num_lines, self.max_libres)
+        self.valores = memoryview(self.mm)[CABECERA.size:].cast("b")  # Sin copiar el archivo
+
+    def close(self):
+        self.valores.release()
+        self.mm.close()
+
+    def covers(self, lines):
+        """Verifica si la posición (máscara de líneas trazadas) está en la tabla"""
+        return (self.num_lines - lines.bit_count()) <= self.max_libres
+
+    def value(self, lines):
+        """Mejor diferencia de cuadros para el jugador en turno en la posición dada"""
+        indices = _bits(self.full_mask ^ lines)
+        return self.valores[self.desplazamientos[len(indices)] + _rango(indices, self.binomiales)]
+
+    def best_line(self, lines):
+        """Retorna la línea que maximiza la diferencia de cuadros en la posición dada"""
+        mejor, mejor_valor = None, None
+        for edge in _bits(self.full_mask ^ lines):
+            hijo = lines | (1 << edge)
+            capturados = sum(1 for box in self.edge_boxes[edge] if hijo & self.box_masks[box] == self.box_masks[box])
+            valor = capturados + self.value(hijo) if capturados else -self.value(hijo)
+            if mejor_valor is None or valor > mejor_valor:
+                mejor, mejor_valor = edge, valor
+        return mejor
+
+
+@lru_cache(maxsize=None)
+def cargar_tabla(size, directorio=DIRECTORIO):
+    """
+    Abre la tabla de finales del tamaño dado si existe; si no, retorna None.
+    Cada tabla se abre una sola vez por proceso y se comparte entre jugadores.
+    """
+    ruta = ruta_tabla(size, directorio)
+    if not os.path.exists(ruta):
+        return None
+    return TablaFinales(ruta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera la tabla de finales del Timbiriche")
+    parser.add_argument("--size", type=int, default=5, help="Puntos por lado del tablero")
+    parser.add_argument("--max-libres", type=int, default=5, help="Máximo de líneas libres en las posiciones de la tabla")
+    parser.add_argument("--salida", help=f"Archivo de salida (por defecto {ruta_tabla('<size>')})")
+    args = parser.parse_args(argv)
+    ruta = generar(args.size, args.max_libres, args.salida)
+    print(f"Tabla escrita en {ruta} ({os.path.getsize(ruta)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,326 +1,377 @@
+import argparse
+import itertools
 import tkinter as tk
-from tkinter import simpledialog
-import random
-import time
+from tkinter import messagebox, simpledialog
+
+import instrumentacion
+from motor_timbiriche import crear_tablero
+from ia_timbiriche import BuscadorTimbiriche, NIVELES
+from tabla_finales import cargar_tabla
+from registro import RegistroPartida, leer_partidas
+
+
+class AnimadorLineas:
+    """
+    Anima el trazo de varias líneas a la vez usando root.after, sin bloquear el
+    bucle de eventos. Cada línea usa un único elemento del canvas que se alarga
+    con coords() en cada paso.
+    """
+
+    def __init__(self, root, canvas, steps=10, interval=20):
+        """
+        Parámetros:
+        - root: la ventana principal de tkinter.
+        - canvas: el canvas donde están los elementos a animar.
+        - steps: número de pasos de cada animación.
+        - interval: milisegundos entre pasos.
+        """
+        self.root = root
+        self.canvas = canvas
+        self.steps = steps
+        self.interval = interval
+        self.active = {}  # Elemento del canvas -> [x1, y1, x2, y2, paso actual]
+        self.job = None   # Llamada programada con root.after
+
+    def start(self, item, x1, y1, x2, y2):
+        """Empieza a animar el elemento desde (x1, y1) hasta (x2, y2)"""
+        self.active[item] = [x1, y1, x2, y2, 0]
+        self.canvas.coords(item, x1, y1, x1, y1)
+        if self.job is None:
+            self.job = self.root.after(self.interval, self._tick)
+
+    def finish(self):
+        """Termina de inmediato todas las animaciones activas"""
+        for item, (x1, y1, x2, y2, _) in self.active.items():
+            self.canvas.coords(item, x1, y1, x2, y2)
+        self.active.clear()
+
+    def _tick(self):
+        """Avanza un paso todas las animaciones activas"""
+        for item, state in list(self.active.items()):
+            x1, y1, x2, y2, step = state
+            step += 1
+            x = x1 + (x2 - x1) * step / self.steps  # Interpola la posición x
+            y = y1 + (y2 - y1) * step / self.steps  # Interpola la posición y
+            self.canvas.coords(item, x1, y1, x, y)
+            if step >= self.steps:
+                del self.active[item]
+            else:
+                state[4] = step
+        self.job = self.root.after(self.interval, self._tick) if self.active else None
+
 
 class Timbiriche:
-    def __init__(self, root, player_choice, size=5):
+    def __init__(self, root, player_choice, size=5, level=0, animate=True, on_game_over=None,
+                 record=None, replay=None, processes=1):
         """
         Constructor de la clase Timbiriche. Inicializa el tablero y sus propiedades.
         
         Parámetros:
         - root: la ventana principal de tkinter.
-        - player_choice: determina si el usuario es el jugador 1 o 2.
+        - player_choice: determina si el usuario es el jugador 1 o 2 (0 = computadora contra computadora).
         - size: tamaño del tablero (mínimo de 5x5).
+        - level: nivel de la computadora (0 = voraz, ver ia_timbiriche.NIVELES).
+        - animate: si es False (modo rápido) las líneas se dibujan sin animación.
+        - on_game_over: función que se llama como on_game_over(winner, score) al
+          terminar el juego (winner es 0 en caso de empate). Por defecto se
+          muestra el resultado en un cuadro de diálogo.
+        - record: RegistroPartida donde se anota cada línea trazada, o None.
+        - replay: jugadas (índices de línea) de una partida registrada; si se
+          dan, nadie juega y la partida se recorre con el teclado: → o espacio
+          avanza una jugada y Fin llega hasta el final.
+        - processes: procesos entre los que la computadora reparte su búsqueda
+          (1 = búsqueda en el mismo proceso).
         """
         self.root = root
-        self.size = max(5, size)        # Asegura que el tamaño mínimo sea 5x5
-        self.grid_size = self.size - 1  # Tamaño de la cuadrícula interna donde se trazan las líneas
+        self.board = crear_tablero(size, self.check_winner)  # Estado y reglas del juego, sin tkinter
+        self.size = self.board.size     # Tamaño del tablero (mínimo 5x5)
+        self.grid_size = self.board.grid_size  # Tamaño de la cuadrícula interna donde se trazan las líneas
         self.cell_size = 50             # Tamaño en píxeles de cada celda
         self.canvas_size = self.size * self.cell_size   # Tamaño del área de dibujo del canvas
-        self.canvas = tk.Canvas(root, width=self.canvas_size, height=self.canvas_size)  # Área de dibujo
-        self.canvas.pack()
-        self.lines = set()              # Conjunto que almacena las líneas ya trazadas
-        self.squares = {}               # Diccionario para almacenar los cuadros completados
+        self.zoom = 1.0                 # Escala actual del dibujo
+
+        # Si el tablero no cabe en la pantalla, el canvas muestra sólo una parte y se desplaza
+        view_width = min(self.canvas_size, root.winfo_screenwidth() - 100)
+        view_height = min(self.canvas_size, root.winfo_screenheight() - 150)
+        self.canvas = tk.Canvas(root, width=view_width, height=view_height,
+                                scrollregion=(0, 0, self.canvas_size, self.canvas_size))  # Área de dibujo
+        x_scroll = tk.Scrollbar(root, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        y_scroll = tk.Scrollbar(root, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.configure(xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
+        x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
+        y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.player_choice = player_choice  # Elección del jugador por el usuario (1 o 2)
-        self.current_player = 1         # Jugador actual, empieza en 1
         self.player_colors = {1: 'red', 2: 'blue'}  # Colores de los jugadores
-        self.score = {1: 0, 2: 0}       # Puntaje de ambos jugadores
-        self.first_click = None         # Primer clic de la línea (punto inicial)
-
-        self.draw_grid()                # Dibuja la cuadrícula de puntos
+        self.score = self.board.score   # Puntaje de ambos jugadores (compartido con el motor)
+        self.on_game_over = on_game_over or self.show_winner
+        self.hover_edge = None          # Línea resaltada bajo el cursor
+        self.record = record            # Registro de la partida en curso
+        self.replay = None if replay is None else iter(replay)  # Jugadas pendientes de la repetición
+        if self.replay is not None:
+            self.player_choice = None   # Nadie juega: los clics no trazan líneas
+        # Jugador de la computadora; en los niveles de búsqueda usa la tabla de finales si fue generada
+        self.ai = BuscadorTimbiriche(self.size, level, endgame_table=cargar_tabla(self.size) if level else None,
+                                     processes=processes)
+        # No se anima en modo rápido ni cuando juega la computadora contra sí misma
+        self.animate = animate and (player_choice in (1, 2) or replay is not None)
+        self.animator = AnimadorLineas(root, self.canvas)
+
+        self.update_score()             # Muestra el marcador en el título de la ventana
+        self.draw_grid()                # Crea todos los elementos del canvas, ocultos salvo los puntos
+        # Un único elemento, oculto mientras no haya línea bajo el cursor, sirve para resaltar
+        self.highlight = self.canvas.create_line(0, 0, 0, 0, fill="gray", width=4, state="hidden")
         self.canvas.bind("<Button-1>", self.click_event)  # Vincula el evento de clic del ratón
-
+        self.canvas.bind("<Motion>", self.motion_event)   # Resalta la línea bajo el cursor
+        self.root.protocol("WM_DELETE_WINDOW", self.close)  # Detiene los procesos de búsqueda al cerrar
+
+        # Rueda del ratón: desplaza el tablero; con Control, cambia el zoom
+        self.canvas.bind("<MouseWheel>", self.scroll_event)
+        self.canvas.bind("<Shift-MouseWheel>", self.scroll_event)
+        self.canvas.bind("<Control-MouseWheel>", self.zoom_event)
+        for button in ("<Button-4>", "<Button-5>", "<Shift-Button-4>", "<Shift-Button-5>"):
+            self.canvas.bind(button, self.scroll_event)
+        for button in ("<Control-Button-4>", "<Control-Button-5>"):
+            self.canvas.bind(button, self.zoom_event)
+
+        if self.replay is not None:
+            for key in ("<Right>", "<space>"):
+                self.root.bind(key, self.step_replay)
+            self.root.bind("<End>", self.fast_forward)
         # Si el turno inicial no es del usuario, ejecuta el turno de la computadora tras 1 segundo
-        if self.current_player != self.player_choice:
+        elif self.current_player != self.player_choice:
             self.root.after(1000, self.computer_turn)
 
+    @property
+    def current_player(self):
+        """Jugador actual según el motor del juego"""
+        return self.board.current_player
+
     def draw_grid(self):
-        """Dibuja la cuadrícula de puntos en el canvas"""
+        """
+        Crea de una vez todos los elementos del canvas: un cuadro y una línea
+        ocultos por cada cuadro y línea del tablero, y los puntos de la cuadrícula.
+        Durante el juego sólo se muestran y recolorean, así que el número de
+        elementos no crece con las jugadas.
+        """
+        self.box_items = []
+        for square in range(self.board.num_boxes):
+            r, c = divmod(square, self.grid_size)
+            x1, y1 = self.to_pixels((c, r))
+            x2, y2 = self.to_pixels((c + 1, r + 1))
+            self.box_items.append(self.canvas.create_rectangle(x1, y1, x2, y2, state="hidden"))
+
+        self.line_items = []
+        for edge in range(self.board.num_lines):
+            (x1, y1), (x2, y2) = self.line_coords(edge)
+            self.line_items.append(self.canvas.create_line(x1, y1, x2, y2, width=2, state="hidden"))
+
         for i in range(self.size):
             for j in range(self.size):
-                x = (i + 0.5) * self.cell_size  # Coordenada x del punto
-                y = (j + 0.5) * self.cell_size  # Coordenada y del punto
+                x, y = self.to_pixels((i, j))  # Coordenadas del punto
                 self.canvas.create_oval(x-5, y-5, x+5, y+5, fill="black")  # Crea un punto circular en la cuadrícula
 
-    def click_event(self, event):
-        """Maneja los eventos de clic del usuario para crear una línea entre dos puntos"""
-        if self.current_player == self.player_choice:       # Solo permite interacción si es el turno del jugador
-            x, y = event.x, event.y                         # Obtiene las coordenadas del clic
-            clicked_point = self.get_closest_point(x, y)    # Obtiene el punto más cercano a las coordenadas clicadas
-
-            if clicked_point:
-
-                if self.first_click is None:
-                    # Si no hay primer clic registrado, lo almacena
-                    self.first_click = clicked_point
-                else:
-                    # Si ya hay un primer clic, intenta trazar la línea
-                    second_click = clicked_point
-
-                    if self.is_valid_line(self.first_click, second_click):  # Verifica si la línea es válida (adyacente)
-                        line = (self.first_click, second_click)
-                        
-                        # Verifica si la línea no ha sido trazada antes (en ambos sentidos)
-                        if line not in self.lines and self.reverse_line(line) not in self.lines:
-                            self.lines.add(line)  # Agrega la línea al conjunto de líneas trazadas
-                            self.animate_line(line)  # Anima la creación de la línea
-                            completed_squares = self.check_square(line)  # Verifica si se ha completado un cuadro
-
-                            if not completed_squares:
-                                # Si no se completa un cuadro, cambia de jugador
-                                self.current_player = 3 - self.current_player
-                            else:
-                                self.update_score()  # Si se completó un cuadro, actualiza el puntaje
-
-                            self.first_click = None  # Reinicia el primer clic para el próximo turno
-
-                            # Si ahora es turno de la computadora, inicia su turno tras 1 segundo
-                            if self.current_player != self.player_choice:
-                                self.root.after(1000, self.computer_turn)
-                    else:
-                        # Si la línea no es válida, reinicia el primer clic
-                        self.first_click = None
-
-    def is_valid_line(self, point1, point2):
-        """Verifica si una línea entre dos puntos es válida (adyacente horizontal o verticalmente)"""
-        x1, y1 = point1
-        x2, y2 = point2
-
-        # Verifica que la línea sea horizontal o vertical (adyacente) pero no diagonal
-        if (x1 == x2 and abs(y1 - y2) == self.cell_size) or (y1 == y2 and abs(x1 - x2) == self.cell_size):
-            return True
-        return False
-
-    def get_closest_point(self, x, y):
-        """Obtiene el punto más cercano en la cuadrícula a las coordenadas dadas"""
-        for i in range(self.size):
-            for j in range(self.size):
-                px, py = (i + 0.5) * self.cell_size, (j + 0.5) * self.cell_size
-                if abs(x - px) < 10 and abs(y - py) < 10:  # Si está cerca de un punto, lo devuelve
-                    return (px, py)
-        return None
-
-    def reverse_line(self, line):
-        """Retorna la línea en orden inverso (punto2, punto1)"""
-        return (line[1], line[0])
-
-    def animate_line(self, line):
-        """Anima la creación de una línea entre dos puntos"""
-        (x1, y1), (x2, y2) = line
-        steps = 10  # Número de pasos para la animación
-        for i in range(steps + 1):
-            x = x1 + (x2 - x1) * i / steps  # Interpola la posición x
-            y = y1 + (y2 - y1) * i / steps  # Interpola la posición y
-            # Dibuja la línea en la posición interpolada con el color del jugador actual
-            self.canvas.create_line(x1, y1, x, y, fill=self.player_colors[self.current_player], width=2)
-            self.root.update()  # Actualiza el canvas
-            time.sleep(0.02)  # Pausa breve para la animación
+    def to_pixels(self, point):
+        """Convierte un punto (columna, fila) del tablero a coordenadas del canvas, según el zoom"""
+        scale = self.cell_size * self.zoom
+        return (point[0] + 0.5) * scale, (point[1] + 0.5) * scale
 
-    def computer_turn(self):
-        """Simula el turno de la computadora, elige una línea basada en completar cuadros cuando sea posible."""
-        
-        available_lines = self.get_available_lines()
-        if not available_lines:
-            print("No hay más líneas disponibles. El juego ha terminado.")
-            return  # Termina el turno de la computadora si no hay líneas disponibles
-
-        lines_to_complete_square = []
-        safe_lines = []
-        dangerous_lines = []
-        
-        # 1. Clasifica las líneas según si completan cuadros, son seguras, o peligrosas
-        for line in available_lines:
-            squares_for_line = self.possible_squares(line)
-            is_dangerous = False
-            completes_square = False
-            
-            for square in squares_for_line:
-                filled_lines = sum(1 for l in square if l in self.lines or self.reverse_line(l) in self.lines)
-                
-                # Si el cuadro ya tiene 3 líneas, completar esta línea cerrará el cuadro
-                if filled_lines == 3:
-                    completes_square = True
-                    break
-                elif filled_lines == 2:
-                    is_dangerous = True
-
-            if completes_square:
-                lines_to_complete_square.append(line)
-            elif is_dangerous:
-                dangerous_lines.append(line)
-            else:
-                safe_lines.append(line)
-        
-        # 2. Estrategia: Priorizar completar cuadros cuando sea posible
-        if lines_to_complete_square:
-            # Elige una línea que complete un cuadro
-            line = random.choice(lines_to_complete_square)
-        elif safe_lines:
-            # Si no hay cuadros para completar, elige una línea segura
-            line = random.choice(safe_lines)
-        elif dangerous_lines:
-            # Como último recurso, elige de las líneas peligrosas
-            line = random.choice(dangerous_lines)
+    def scroll_event(self, event):
+        """Desplaza el tablero con la rueda del ratón (con Shift, en horizontal)"""
+        step = -1 if event.num == 4 or getattr(event, "delta", 0) > 0 else 1
+        if event.state & 0x0001:  # Shift
+            self.canvas.xview_scroll(step, "units")
         else:
-            print("No hay más líneas disponibles para la computadora.")
-            return  # Termina el turno si no hay líneas para trazar
+            self.canvas.yview_scroll(step, "units")
+
+    def zoom_event(self, event):
+        """Acerca o aleja el tablero alrededor del cursor"""
+        factor = 1.25 if event.num == 4 or getattr(event, "delta", 0) > 0 else 0.8
+        if not 0.2 <= self.zoom * factor <= 4:
+            return
+        self.animator.finish()  # Las animaciones guardan coordenadas con la escala anterior
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        self.zoom *= factor
+        self.canvas.scale("all", 0, 0, factor, factor)
+        size = self.canvas_size * self.zoom
+        self.canvas.configure(scrollregion=(0, 0, size, size))
+        # Mantiene bajo el cursor el mismo punto del tablero
+        self.canvas.xview_moveto(max(0, x * factor - event.x) / size)
+        self.canvas.yview_moveto(max(0, y * factor - event.y) / size)
+
+    def line_coords(self, edge):
+        """Retorna los extremos en píxeles de la línea con el índice dado"""
+        point1, point2 = self.board.endpoints(edge)
+        return self.to_pixels(point1), self.to_pixels(point2)
+
+    def edge_at(self, x, y):
+        """Obtiene en O(1) la línea libre más cercana a las coordenadas de la ventana, o None"""
+        scale = self.cell_size * self.zoom
+        x, y = self.canvas.canvasx(x), self.canvas.canvasy(y)  # Tiene en cuenta el desplazamiento
+        edge = self.board.edge_near(x / scale - 0.5, y / scale - 0.5)
+        if edge is None or self.board.is_drawn(edge):
+            return None
+        return edge
 
-        # 3. Realiza la jugada
-        self.lines.add(line)
-        self.animate_line(line)
-        
-        completed_squares = self.check_square(line)
-        
-        if not completed_squares:
-            # Cambia de jugador si no completó un cuadro
-            self.current_player = 3 - self.current_player
-        else:
-            self.update_score()  # Si completó un cuadro, actualiza el puntaje
+    def click_event(self, event):
+        """Maneja los eventos de clic del usuario: un clic cerca de una línea libre la traza"""
+        if self.current_player == self.player_choice:       # Solo permite interacción si es el turno del jugador
+            edge = self.edge_at(event.x, event.y)            # Obtiene la línea más cercana al clic
 
-        # Si sigue siendo el turno de la computadora, vuelve a jugar tras 1 segundo
-        if self.current_player != self.player_choice:
-            self.root.after(1000, self.computer_turn)
+            if edge is not None:
+                self.set_hover(None)
+                self.play_line(edge)
+
+                # Si ahora es turno de la computadora, inicia su turno tras 1 segundo
+                if self.current_player != self.player_choice and not self.board.is_over():
+                    self.root.after(1000, self.computer_turn)
 
+    def motion_event(self, event):
+        """Resalta la línea libre bajo el cursor durante el turno del usuario"""
+        if self.current_player == self.player_choice:
+            self.set_hover(self.edge_at(event.x, event.y))
+        else:
+            self.set_hover(None)
+
+    def set_hover(self, edge):
+        """Mueve el resaltado a la línea dada, o lo oculta si es None"""
+        if edge == self.hover_edge:
+            return  # Nada que redibujar
+        self.hover_edge = edge
+        if edge is None:
+            self.canvas.itemconfig(self.highlight, state="hidden")
+        else:
+            (x1, y1), (x2, y2) = self.line_coords(edge)
+            self.canvas.coords(self.highlight, x1, y1, x2, y2)
+            self.canvas.itemconfig(self.highlight, state="normal")
+
+    def animate_line(self, edge, player):
+        """Muestra la línea con el color del jugador que la trazó, animada si corresponde"""
+        item = self.line_items[edge]
+        self.canvas.itemconfig(item, fill=self.player_colors[player], state="normal")
+        if self.animate:
+            (x1, y1), (x2, y2) = self.line_coords(edge)
+            self.animator.start(item, x1, y1, x2, y2)  # El bucle de eventos sigue atendiendo clics
+        return item
+
+    def play_line(self, edge):
+        """Traza la línea en el motor, la anima y rellena los cuadros que complete"""
+        player = self.current_player
+        if self.record is not None:
+            self.record.jugada(edge)  # Se anota antes de que el motor pueda terminar la partida
+        completed_squares = self.board.add_line(edge)  # El motor cambia de jugador si no se completa un cuadro
+        self.animate_line(edge, player)
+        for square in completed_squares:
+            self.fill_square(square, player)  # Rellena el cuadro con el color del jugador
+        if completed_squares:
+            self.update_score()  # Si se completó un cuadro, actualiza el puntaje
+        return completed_squares
 
+    def computer_turn(self):
+        """Simula el turno de la computadora con la estrategia del nivel elegido."""
+        if self.board.is_over():
+            return  # El juego ya terminó
 
-    def get_available_lines(self):
-        """Obtiene todas las líneas disponibles para ser trazadas en el tablero"""
-        available_lines = []
-
-        for i in range(self.grid_size):  # Recorre la cuadrícula interna para líneas horizontales y verticales
-            for j in range(self.grid_size):
-                # Línea horizontal: Se dibuja desde (i, j) hasta (i+1, j)
-                line_horizontal = (
-                    ((i + 0.5) * self.cell_size, (j + 0.5) * self.cell_size), 
-                    ((i + 1.5) * self.cell_size, (j + 0.5) * self.cell_size)
-                )
-                if line_horizontal not in self.lines and self.reverse_line(line_horizontal) not in self.lines:
-                    available_lines.append(line_horizontal)
-
-                # Línea vertical: Se dibuja desde (i, j) hasta (i, j+1)
-                line_vertical = (
-                    ((i + 0.5) * self.cell_size, (j + 0.5) * self.cell_size), 
-                    ((i + 0.5) * self.cell_size, (j + 1.5) * self.cell_size)
-                )
-                if line_vertical not in self.lines and self.reverse_line(line_vertical) not in self.lines:
-                    available_lines.append(line_vertical)
-
-        # Añadir las líneas del borde derecho e inferior
-        # Líneas horizontales de la última fila
-        for i in range(self.grid_size):
-            line = (
-                ((i + 0.5) * self.cell_size, (self.grid_size + 0.5) * self.cell_size), 
-                ((i + 1.5) * self.cell_size, (self.grid_size + 0.5) * self.cell_size)
-            )
-            if line not in self.lines and self.reverse_line(line) not in self.lines:
-                available_lines.append(line)
-
-        # Líneas verticales de la última columna
-        for j in range(self.grid_size):
-            line = (
-                ((self.grid_size + 0.5) * self.cell_size, (j + 0.5) * self.cell_size), 
-                ((self.grid_size + 0.5) * self.cell_size, (j + 1.5) * self.cell_size)
-            )
-            if line not in self.lines and self.reverse_line(line) not in self.lines:
-                available_lines.append(line)
-
-        return available_lines
-
-
-
-    def check_square(self, line):
-        """Verifica si la línea actual completa un cuadro y lo registra"""
-        completed_squares = []
-        for square in self.possible_squares(line):  # Revisa los cuadros asociados a la línea actual
-            # Verifica si todas las líneas de un cuadro están trazadas
-            if all(l in self.lines or self.reverse_line(l) in self.lines for l in square):
-                self.squares[square] = self.current_player  # Asigna el cuadro al jugador actual
-                self.fill_square(square)  # Rellena el cuadro con el color del jugador
-                completed_squares.append(square)
+        self.play_line(self.ai.choose_line(self.board))
 
-        return completed_squares
+        # Si sigue siendo el turno de la computadora, vuelve a jugar tras 1 segundo
+        if self.current_player != self.player_choice and not self.board.is_over():
+            self.root.after(1000, self.computer_turn)
 
-    def possible_squares(self, line):
-        """Obtiene los posibles cuadros que podrían completarse con la línea actual"""
-        squares = []
-        (x1, y1), (x2, y2) = line
-
-        # Cuadro a la izquierda o derecha de una línea vertical
-        if x1 == x2 and abs(y1 - y2) == self.cell_size:
-            # Cuadro a la izquierda
-            left_square = (
-                ((x1 - self.cell_size, y1), (x1, y1)),
-                ((x1 - self.cell_size, y2), (x1, y2)),
-                ((x1 - self.cell_size, y1), (x1 - self.cell_size, y2)),
-                ((x1, y1), (x1, y2))
-            )
-            squares.append(left_square)
-
-            # Cuadro a la derecha
-            right_square = (
-                ((x1, y1), (x1 + self.cell_size, y1)),
-                ((x1, y2), (x1 + self.cell_size, y2)),
-                ((x1, y1), (x1, y2)),
-                ((x1 + self.cell_size, y1), (x1 + self.cell_size, y2))
-            )
-            squares.append(right_square)
-
-        # Cuadro arriba o abajo de una línea horizontal
-        if y1 == y2 and abs(x1 - x2) == self.cell_size:
-            # Cuadro arriba
-            upper_square = (
-                ((x1, y1 - self.cell_size), (x1, y1)),
-                ((x2, y2 - self.cell_size), (x2, y2)),
-                ((x1, y1 - self.cell_size), (x2, y2 - self.cell_size)),
-                ((x1, y1), (x2, y2))
-            )
-            squares.append(upper_square)
-
-            # Cuadro abajo
-            lower_square = (
-                ((x1, y1), (x1, y1 + self.cell_size)),
-                ((x2, y2), (x2, y2 + self.cell_size)),
-                ((x1, y1 + self.cell_size), (x2, y2 + self.cell_size)),
-                ((x1, y1), (x2, y2))
-            )
-            squares.append(lower_square)
-
-        return squares
-
-    def fill_square(self, square):
+    def step_replay(self, event=None):
+        """Traza la siguiente jugada de la partida repetida; retorna False si ya no quedan"""
+        edge = next(self.replay, None)
+        if edge is None:
+            return False
+        self.play_line(edge)
+        return True
+
+    def fast_forward(self, event=None):
+        """Traza sin animación todas las jugadas que faltan de la partida repetida"""
+        self.animator.finish()
+        animate, self.animate = self.animate, False
+        while self.step_replay():
+            pass
+        self.animate = animate
+
+    def close(self):
+        """Cierra la ventana y detiene los procesos de la búsqueda en paralelo, si los hay"""
+        self.ai.close()
+        self.root.destroy()
+
+    def fill_square(self, square, player):
         """Rellena el cuadro completado con el color del jugador"""
-        x1, y1 = square[0][0]
-        x2, y2 = square[1][1]
-        self.canvas.create_rectangle(x1, y1, x2, y2, fill=self.player_colors[self.current_player])
+        self.canvas.itemconfig(self.box_items[square], fill=self.player_colors[player], state="normal")
 
     def update_score(self):
-        """Actualiza el marcador de los jugadores"""
-        # Suma los cuadros completados por el jugador actual
-        self.score[self.current_player] = sum(1 for s in self.squares.values() if s == self.current_player)
-        print(f"Jugador 1 (rojo): {self.score[1]} | Jugador 2 (azul): {self.score[2]}")
-        self.check_winner()  # Verifica si el juego ha terminado
-
-    def check_winner(self):
-        """Verifica si ya se han completado todos los cuadros para determinar un ganador"""
-        total_squares = self.grid_size * self.grid_size  # Número total de cuadros posibles
-        if len(self.squares) == total_squares:
-            if self.score[1] == self.score[2]:
-                print("¡El juego ha terminado en empate!")  # Imprime empate si ambos puntajes son iguales
-            else:
-                winner = max(self.score, key=self.score.get)  # Determina el ganador según el puntaje
-                print(f"¡El jugador {winner} ha ganado!")  # Imprime el ganador en la consola
+        """Muestra el marcador de los jugadores en el título de la ventana"""
+        # El motor lleva el puntaje de forma incremental
+        self.root.title(f"Timbiriche - Jugador 1 (rojo): {self.score[1]} | Jugador 2 (azul): {self.score[2]}")
+
+    def check_winner(self, winner, score):
+        """El motor la llama al completarse el último cuadro, sin importar quién trazó la línea"""
+        self.update_score()
+        if self.record is not None:
+            self.record.terminar(ganador=winner, puntaje=[score[1], score[2]])
+            self.record = None
+        # Se avisa cuando termine de dibujarse la jugada actual
+        self.root.after_idle(self.on_game_over, winner, score)
+
+    def show_winner(self, winner, score):
+        """Muestra el resultado del juego en un cuadro de diálogo"""
+        if winner == 0:
+            messagebox.showinfo("Fin del juego", "¡El juego ha terminado en empate!")  # Empate si ambos puntajes son iguales
+        else:
+            messagebox.showinfo("Fin del juego", f"¡El jugador {winner} ha ganado!")
 
 
 if __name__ == "__main__":
-    root = tk.Tk()
+    parser = argparse.ArgumentParser(description="Timbiriche")
+    parser.add_argument("--size", type=int, help="Tamaño del tablero (mínimo 5)")
+    parser.add_argument("--jugador", type=int, choices=(0, 1, 2), help="Jugador del usuario (0 = computadora contra computadora)")
+    parser.add_argument("--nivel", type=int, choices=sorted(NIVELES), help="Nivel de la computadora")
+    parser.add_argument("--rapido", action="store_true", help="Dibuja las líneas sin animación")
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos para la búsqueda de la computadora")
+    parser.add_argument("--registro", help="Agrega la partida jugada a este archivo de registro")
+    parser.add_argument("--repetir", help="Recorre una partida de este archivo de registro")
+    parser.add_argument("--partida", type=int, default=0, help="Número de la partida a repetir (desde 0)")
+    parser.add_argument("--perfil", nargs="?", const="", metavar="ARCHIVO",
+                        help="Mide las rutas críticas; con ARCHIVO también guarda un perfil de cProfile")
+    args = parser.parse_args()
+
+    # Instrumentación opcional (también con la variable de entorno JUEGOS_PERFIL)
+    instrumentacion.configurar(args.perfil, Timbiriche, ("computer_turn", "animate_line"))
 
-    # Solicita al usuario el tamaño del tablero
-    size = simpledialog.askinteger("Tamaño del Tablero", "Introduce el tamaño del tablero (mínimo 5):", minvalue=5)
-    
-    # Solicita al usuario que elija ser el jugador 1 o 2
-    player_choice = simpledialog.askinteger("Jugador", "¿Quieres ser el jugador 1 o 2?", minvalue=1, maxvalue=2)
+    root = tk.Tk()
 
-    # Crea una instancia del juego y arranca la interfaz gráfica
-    game = Timbiriche(root, player_choice, size)
-    root.mainloop()
\ No newline at end of file
+    if args.repetir:
+        # Sólo se leen las líneas del archivo hasta la partida pedida
+        partidas = (p for p in leer_partidas(args.repetir) if p.juego == "timbiriche")
+        partida = next(itertools.islice(partidas, args.partida, None), None)
+        if partida is None:
+            parser.error(f"{args.repetir} no tiene la partida de Timbiriche {args.partida}")
+        game = Timbiriche(root, None, partida.cabecera["size"], animate=not args.rapido, replay=partida)
+    else:
+        # Solicita al usuario el tamaño del tablero
+        size = args.size or simpledialog.askinteger("Tamaño del Tablero", "Introduce el tamaño del tablero (mínimo 5):", minvalue=5)
+
+        # Solicita al usuario que elija ser el jugador 1 o 2
+        player_choice = args.jugador
+        if player_choice is None:
+            player_choice = simpledialog.askinteger("Jugador", "¿Quieres ser el jugador 1 o 2?", minvalue=1, maxvalue=2)
+
+        # Solicita el nivel de la computadora (0 es la estrategia voraz)
+        level = args.nivel
+        if level is None:
+            level = simpledialog.askinteger("Nivel", f"Nivel de la computadora (0 a {max(NIVELES)}):",
+                                            minvalue=0, maxvalue=max(NIVELES), initialvalue=2)
+
+        # Crea una instancia del juego, que anota sus jugadas si se pidió un registro
+        record = None
+        if args.registro:
+            record = RegistroPartida(args.registro, "timbiriche", size=max(5, size), jugador=player_choice, nivel=level)
+        game = Timbiriche(root, player_choice, size, level, animate=not args.rapido, record=record,
+                          processes=args.procesos)
+
+    # Arranca la interfaz gráfica
+    root.mainloop()